@@ -3,20 +3,39 @@ Espresso Algorithm
 Heuristic logic minimization algorithm used in CAD tools
 """
 
-from typing import List, Set, Dict, Tuple, Optional
+from typing import List, Set, Dict, Tuple, Optional, Iterable
+import bisect
 import copy
+import functools
 import itertools
+import operator
+
+
+# Maps a cube string onto its care mask ('-' -> 0, literal -> 1)
+_CARE_TABLE = str.maketrans('01-', '110')
+
+
+def _minterm_bitmap(minterms: Iterable[int]) -> int:
+    """Build a bitmap with bit m set for every minterm m"""
+    return functools.reduce(operator.or_, (1 << m for m in minterms), 0)
 
 
 class Cube:
     """
     Represents a cube (product term) in the Espresso algorithm
-    Each cube is represented as a string with characters:
+    Each cube is stored as two bit masks over the variables:
+    care - bit set where the variable appears as a literal
+    val  - value of that literal (always 0 where care is clear)
+    Variable i maps to bit (n - 1 - i), so a minterm cube has val == minterm.
+    
+    The string representation uses the characters:
     '0' - variable appears complemented
     '1' - variable appears uncomplemented  
     '-' - variable doesn't appear (don't care)
     """
     
+    __slots__ = ('care', 'val', 'n')
+    
     def __init__(self, representation: str):
         """
         Initialize cube
@@ -24,8 +43,46 @@ class Cube:
         Args:
             representation: String representation of the cube
         """
-        self.representation = representation
-        self.num_variables = len(representation)
+        self.n = len(representation)
+        if representation:
+            self.care = int(representation.translate(_CARE_TABLE), 2)
+            self.val = int(representation.replace('-', '0'), 2)
+        else:
+            self.care = 0
+            self.val = 0
+    
+    @classmethod
+    def from_masks(cls, care: int, val: int, num_variables: int) -> 'Cube':
+        """
+        Build a cube directly from its bit masks
+        
+        Args:
+            care: Mask of positions that hold a literal
+            val: Literal values (bits outside care are ignored)
+            num_variables: Number of variables in the cube
+            
+        Returns:
+            New cube
+        """
+        cube = cls.__new__(cls)
+        cube.care = care
+        cube.val = val & care
+        cube.n = num_variables
+        return cube
+    
+    @property
+    def representation(self) -> str:
+        """String form of the cube, rebuilt from the bit masks"""
+        if not self.n:
+            return ''
+        care_bits = format(self.care, f'0{self.n}b')
+        val_bits = format(self.val, f'0{self.n}b')
+        return ''.join(v if c == '1' else '-' for c, v in zip(care_bits, val_bits))
+    
+    @property
+    def num_variables(self) -> int:
+        """Number of variables in the cube"""
+        return self.n
     
     def intersect(self, other: 'Cube') -> Optional['Cube']:
         """
@@ -37,21 +94,13 @@ class Cube:
         Returns:
             Intersection cube or None if intersection is empty
         """
-        if len(self.representation) != len(other.representation):
+        if self.n != other.n:
             return None
         
-        result = ""
-        for i, (c1, c2) in enumerate(zip(self.representation, other.representation)):
-            if c1 == '-':
-                result += c2
-            elif c2 == '-':
-                result += c1
-            elif c1 == c2:
-                result += c1
-            else:
-                return None  # Empty intersection
+        if (self.val ^ other.val) & self.care & other.care:
+            return None  # Empty intersection
         
-        return Cube(result)
+        return Cube.from_masks(self.care | other.care, self.val | other.val, self.n)
     
     def contains(self, other: 'Cube') -> bool:
         """
@@ -63,12 +112,7 @@ class Cube:
         Returns:
             True if this cube contains the other
         """
-        for c1, c2 in zip(self.representation, other.representation):
-            if c1 != '-' and c2 != '-' and c1 != c2:
-                return False
-            if c1 == '-' and c2 != '-':
-                return False
-        return True
+        return (self.care & ~other.care) == 0 and ((self.val ^ other.val) & self.care) == 0
     
     def distance(self, other: 'Cube') -> int:
         """
@@ -80,11 +124,7 @@ class Cube:
         Returns:
             Distance between cubes
         """
-        distance = 0
-        for c1, c2 in zip(self.representation, other.representation):
-            if (c1 != '-' and c2 != '-' and c1 != c2):
-                distance += 1
-        return distance
+        return ((self.val ^ other.val) & self.care & other.care).bit_count()
     
     def can_merge(self, other: 'Cube') -> bool:
         """
@@ -111,22 +151,13 @@ class Cube:
         if not self.can_merge(other):
             return None
         
-        result = ""
-        for c1, c2 in zip(self.representation, other.representation):
-            if c1 == c2:
-                result += c1
-            elif (c1 != '-' and c2 != '-' and c1 != c2):
-                result += '-'
-            elif c1 == '-':
-                result += c2
-            elif c2 == '-':
-                result += c1
-        
-        return Cube(result)
+        conflict = (self.val ^ other.val) & self.care & other.care
+        care = (self.care | other.care) & ~conflict
+        return Cube.from_masks(care, self.val | other.val, self.n)
     
     def literal_count(self) -> int:
         """Count number of literals in cube"""
-        return sum(1 for c in self.representation if c != '-')
+        return self.care.bit_count()
     
     def to_expression(self, variables: List[str]) -> str:
         """
@@ -138,15 +169,14 @@ class Cube:
         Returns:
             Boolean expression string
         """
-        if len(variables) != len(self.representation):
+        if len(variables) != self.n:
             raise ValueError("Number of variables must match representation length")
         
         literals = []
-        for i, char in enumerate(self.representation):
-            if char == '1':
-                literals.append(variables[i])
-            elif char == '0':
-                literals.append(variables[i] + "'")
+        for i in range(self.n):
+            bit = 1 << (self.n - 1 - i)
+            if self.care & bit:
+                literals.append(variables[i] if self.val & bit else variables[i] + "'")
         
         return ''.join(literals) if literals else '1'
     
@@ -157,15 +187,18 @@ class Cube:
         return f"Cube({self.representation})"
     
     def __eq__(self, other) -> bool:
-        return isinstance(other, Cube) and self.representation == other.representation
+        return (isinstance(other, Cube) and self.n == other.n and
+                self.care == other.care and self.val == other.val)
     
     def __hash__(self) -> int:
-        return hash(self.representation)
+        return hash((self.care, self.val, self.n))
 
 
 class Cover:
     """Represents a cover (set of cubes) in the Espresso algorithm"""
     
+    __slots__ = ('cubes', '_index')
+    
     def __init__(self, cubes: List[Cube] = None):
         """
         Initialize cover
@@ -174,20 +207,40 @@ class Cover:
             cubes: List of cubes in the cover
         """
         self.cubes = cubes if cubes else []
+        self._index = set(self.cubes)  # Membership index for self.cubes
+    
+    @classmethod
+    def from_masks(cls, cares: Iterable[int], vals: Iterable[int], num_variables: int) -> 'Cover':
+        """
+        Build a cover from parallel sequences of care and value masks
+        
+        Args:
+            cares: Care mask of each cube
+            vals: Value mask of each cube
+            num_variables: Number of variables in each cube
+            
+        Returns:
+            Cover with duplicate cubes dropped (first occurrence kept)
+        """
+        cubes = dict.fromkeys(Cube.from_masks(care, val, num_variables)
+                              for care, val in zip(cares, vals))
+        return cls(list(cubes))
     
     def add_cube(self, cube: Cube) -> None:
         """Add cube to cover"""
-        if cube not in self.cubes:
+        if cube not in self._index:
+            self._index.add(cube)
             self.cubes.append(cube)
     
     def remove_cube(self, cube: Cube) -> None:
         """Remove cube from cover"""
-        if cube in self.cubes:
+        if cube in self._index:
+            self._index.discard(cube)
             self.cubes.remove(cube)
     
     def copy(self) -> 'Cover':
         """Create copy of cover"""
-        return Cover([cube for cube in self.cubes])
+        return Cover(list(self.cubes))
     
     def size(self) -> int:
         """Get number of cubes in cover"""
@@ -224,7 +277,32 @@ class EspressoAlgorithm:
         self.variables = [f'A{i}' for i in range(num_variables)]
         self.on_set = Cover()  # Cubes where function = 1
         self.dc_set = Cover()  # Don't care cubes
-        self.off_set = Cover() # Cubes where function = 0
+        
+        # Minterm bitmaps: bit m of an integer stands for minterm m.
+        # axis_masks[b] has bit m set iff bit b of m is 1, so the minterms
+        # covered by a cube are the AND of one axis mask (or its complement)
+        # per literal.
+        self.all_minterms = (1 << (2 ** num_variables)) - 1
+        self.axis_masks = [self._build_axis_mask(b) for b in range(num_variables)]
+        self.on_bitmap = 0   # Minterms where function = 1
+        self.off_bitmap = 0  # Minterms where function = 0
+    
+    def _build_axis_mask(self, bit: int) -> int:
+        """
+        Build the minterm bitmap of all minterms with the given bit set
+        
+        Args:
+            bit: Bit position within the minterm index
+            
+        Returns:
+            Bitmap with bit m set iff (m >> bit) & 1
+        """
+        half = 1 << bit
+        # One period is `half` zeros followed by `half` ones; repeating it is
+        # a multiplication by the all-ones pattern with that period.
+        block = ((1 << half) - 1) << half
+        period_repeat = self.all_minterms // ((1 << (2 * half)) - 1)
+        return block * period_repeat
     
     def set_function(self, minterms: List[int], dont_cares: List[int] = None) -> None:
         """
@@ -234,31 +312,45 @@ class EspressoAlgorithm:
             minterms: List of minterms where function = 1
             dont_cares: List of don't care terms (optional)
         """
-        # Convert minterms to cubes
-        self.on_set = Cover()
-        for minterm in minterms:
-            cube_repr = format(minterm, f'0{self.num_variables}b')
-            self.on_set.add_cube(Cube(cube_repr))
+        full_care = (1 << self.num_variables) - 1
+        
+        # Convert minterms to cubes (a minterm's index is its value mask)
+        self.on_set = Cover.from_masks(itertools.repeat(full_care), minterms,
+                                       self.num_variables)
         
         # Convert don't cares to cubes
-        self.dc_set = Cover()
-        if dont_cares:
-            for dc in dont_cares:
-                cube_repr = format(dc, f'0{self.num_variables}b')
-                self.dc_set.add_cube(Cube(cube_repr))
+        self.dc_set = Cover.from_masks(itertools.repeat(full_care), dont_cares or [],
+                                       self.num_variables)
         
-        # Generate off-set (all other minterms)
-        self._generate_off_set(minterms, dont_cares or [])
+        # The off-set is never enumerated: it is the complement of the
+        # ON-set and don't care bitmaps
+        self.on_bitmap = _minterm_bitmap(minterms)
+        dc_bitmap = _minterm_bitmap(dont_cares or [])
+        self.off_bitmap = self.all_minterms & ~(self.on_bitmap | dc_bitmap)
     
-    def _generate_off_set(self, minterms: List[int], dont_cares: List[int]) -> None:
-        """Generate off-set from minterms and don't cares"""
-        self.off_set = Cover()
-        all_specified = set(minterms) | set(dont_cares)
+    def _cube_bitmap(self, care: int, val: int) -> int:
+        """
+        Compute the bitmap of minterms covered by a cube
         
-        for i in range(2 ** self.num_variables):
-            if i not in all_specified:
-                cube_repr = format(i, f'0{self.num_variables}b')
-                self.off_set.add_cube(Cube(cube_repr))
+        Args:
+            care: Care mask of the cube
+            val: Value mask of the cube
+            
+        Returns:
+            Minterm bitmap of the cube
+        """
+        axis_masks = self.axis_masks
+        bitmap = self.all_minterms
+        
+        # Visit only the literal positions, lowest set bit first
+        while care:
+            low = care & -care
+            care ^= low
+            if val & low:
+                bitmap &= axis_masks[low.bit_length() - 1]
+            else:
+                bitmap &= ~axis_masks[low.bit_length() - 1]
+        return bitmap
     
     def minimize(self, max_iterations: int = 20) -> Dict:
         """
@@ -278,30 +370,43 @@ class EspressoAlgorithm:
                 'cost': 0
             }
         
-        # Initialize current cover
-        current_cover = self.on_set.copy()
+        # Empty off-set: the function is a tautology, a single universal cube
+        if not self.off_bitmap:
+            universal_cube = Cube.from_masks(0, 0, self.num_variables)
+            return {
+                'minimized_cover': [universal_cube.representation],
+                'simplified_expression': '1',
+                'iterations': 0,
+                'cost': 0,
+                'cube_count': 1
+            }
+        
+        # Initialize current cover with a prime, irredundant cover of the
+        # ON-set (each phase builds a new Cover, so the ON-set is never
+        # modified and needs no copy)
+        current_cover = self._irredundant(self._expand(self.on_set))
         iteration = 0
         
         # Main Espresso loop
         while iteration < max_iterations:
             old_cost = current_cover.literal_count()
             
+            # REDUCE phase
+            reduced_cover = self._reduce(current_cover)
+            
             # EXPAND phase
-            expanded_cover = self._expand(current_cover)
+            expanded_cover = self._expand(reduced_cover)
             
             # IRREDUNDANT phase  
             irredundant_cover = self._irredundant(expanded_cover)
             
-            # REDUCE phase
-            reduced_cover = self._reduce(irredundant_cover)
-            
-            new_cost = reduced_cover.literal_count()
+            new_cost = irredundant_cover.literal_count()
             
             # Check for improvement
             if new_cost >= old_cost:
                 break
             
-            current_cover = reduced_cover
+            current_cover = irredundant_cover
             iteration += 1
         
         # Generate final results
@@ -331,7 +436,16 @@ class EspressoAlgorithm:
             expanded_cube = self._expand_cube(cube, cover)
             expanded_cover.add_cube(expanded_cube)
         
-        return expanded_cover
+        # Drop cubes that another expanded cube already contains. Only a
+        # cube with fewer literals can contain another, so visiting them
+        # in order of literal count lets one pass find every survivor.
+        kept = []
+        for cube in sorted(expanded_cover.cubes, key=lambda c: c.literal_count()):
+            if not any(other.contains(cube) for other in kept):
+                kept.append(cube)
+        kept = set(kept)
+        
+        return Cover([cube for cube in expanded_cover.cubes if cube in kept])
     
     def _expand_cube(self, cube: Cube, cover: Cover) -> Cube:
         """
@@ -344,41 +458,48 @@ class EspressoAlgorithm:
         Returns:
             Maximally expanded cube
         """
-        current_cube = Cube(cube.representation)
+        care, val = cube.care, cube.val
+        
+        # A cube that already hits the off-set cannot be expanded at all
+        if not self._is_valid_expansion(care, val):
+            return cube
+        
+        off_bitmap = self.off_bitmap
+        bitmap = self._cube_bitmap(care, val)
         
-        # Try expanding each literal position
+        # Try expanding each literal position, working on the masks only
         for i in range(self.num_variables):
-            if current_cube.representation[i] != '-':
-                # Try making this position don't care
-                test_repr = (current_cube.representation[:i] + '-' + 
-                           current_cube.representation[i+1:])
-                test_cube = Cube(test_repr)
+            bit = 1 << (self.num_variables - 1 - i)
+            if care & bit:
+                # Making this position don't care only adds the minterms on
+                # the other side of the axis: the current bitmap shifted by
+                # the weight of this bit. The expansion is valid iff that
+                # half avoids the off-set.
+                if val & bit:
+                    mirror = bitmap >> bit
+                else:
+                    mirror = bitmap << bit
                 
-                # Check if expansion is valid (doesn't intersect off-set)
-                if self._is_valid_expansion(test_cube):
-                    current_cube = test_cube
+                if not (off_bitmap & mirror):
+                    care &= ~bit
+                    val &= ~bit
+                    bitmap |= mirror
         
-        return current_cube
+        return Cube.from_masks(care, val, self.num_variables)
     
-    def _is_valid_expansion(self, cube: Cube) -> bool:
+    def _is_valid_expansion(self, care: int, val: int) -> bool:
         """
         Check if cube expansion is valid (doesn't cover off-set minterms)
         
         Args:
-            cube: Cube to validate
+            care: Care mask of the candidate cube
+            val: Value mask of the candidate cube
             
         Returns:
             True if expansion is valid
         """
         # Check intersection with off-set
-        for off_cube in self.off_set.cubes:
-            if cube.intersect(off_cube) is not None:
-                # Check if intersection is non-empty minterm
-                intersection = cube.intersect(off_cube)
-                if intersection and '-' not in intersection.representation:
-                    return False
-        
-        return True
+        return (self.off_bitmap & self._cube_bitmap(care, val)) == 0
     
     def _irredundant(self, cover: Cover) -> Cover:
         """
@@ -392,10 +513,15 @@ class EspressoAlgorithm:
         """
         irredundant_cover = Cover()
         
+        # Only a cube with strictly fewer literals can contain another one,
+        # so sort by literal count and search the matching prefix only
+        by_size = sorted(cover.cubes, key=lambda c: c.literal_count())
+        sizes = [c.literal_count() for c in by_size]
+        
         for cube in cover.cubes:
             # Check if cube is redundant
-            other_cubes = [c for c in cover.cubes if c != cube]
-            if not self._is_cube_redundant(cube, other_cubes):
+            larger_cubes = by_size[:bisect.bisect_left(sizes, cube.literal_count())]
+            if not self._is_cube_redundant(cube, larger_cubes):
                 irredundant_cover.add_cube(cube)
         
         return irredundant_cover
@@ -411,10 +537,13 @@ class EspressoAlgorithm:
         Returns:
             True if cube is redundant
         """
-        # Simple check: if any other cube contains this cube, it's redundant
-        for other_cube in other_cubes:
-            if other_cube.contains(cube):
-                return True
+        # Simple check: if any other cube contains this cube, it's redundant.
+        # The containment test is inlined on the masks so the whole scan is
+        # a single any() over integer operations.
+        care, val = cube.care, cube.val
+        if any(not (other.care & ~care) and not ((other.val ^ val) & other.care)
+               for other in other_cubes):
+            return True
         
         # More complex redundancy checking would involve checking if
         # the union of other cubes covers all minterms of this cube
@@ -422,7 +551,7 @@ class EspressoAlgorithm:
     
     def _reduce(self, cover: Cover) -> Cover:
         """
-        REDUCE operation: Reduce cubes to remove unnecessary literals
+        REDUCE operation: Shrink cubes to the ON-set minterms only they cover
         
         Args:
             cover: Input cover
@@ -431,56 +560,55 @@ class EspressoAlgorithm:
             Reduced cover
         """
         reduced_cover = Cover()
-        
-        for cube in cover.cubes:
-            reduced_cube = self._reduce_cube(cube, cover)
-            reduced_cover.add_cube(reduced_cube)
+        cubes = cover.cubes
+        bitmaps = [self._cube_bitmap(cube.care, cube.val) for cube in cubes]
+        
+        # later_bitmaps[i] is the union of the cubes after position i
+        later_bitmaps = [0] * (len(cubes) + 1)
+        for i in range(len(cubes) - 1, -1, -1):
+            later_bitmaps[i] = later_bitmaps[i + 1] | bitmaps[i]
+        
+        # Cubes are reduced in turn against the current cover: the cubes
+        # before position i are already in their reduced form
+        reduced_bitmap = 0
+        for i, cube in enumerate(cubes):
+            reduced_cube = self._reduce_cube(cube, reduced_bitmap | later_bitmaps[i + 1])
+            if reduced_cube is not None:
+                reduced_cover.add_cube(reduced_cube)
+                reduced_bitmap |= self._cube_bitmap(reduced_cube.care, reduced_cube.val)
         
         return reduced_cover
     
-    def _reduce_cube(self, cube: Cube, cover: Cover) -> Cube:
+    def _reduce_cube(self, cube: Cube, other_bitmap: int) -> Optional[Cube]:
         """
-        Reduce a single cube by removing unnecessary literals
+        Reduce a single cube to the smallest cube that still covers the
+        ON-set minterms no other cube covers
         
         Args:
             cube: Cube to reduce
-            cover: Current cover context
+            other_bitmap: Minterm bitmap covered by the other cubes in cover
             
         Returns:
-            Reduced cube
+            Reduced cube, or None if the other cubes already cover it
         """
-        current_cube = Cube(cube.representation)
+        essential = self._cube_bitmap(cube.care, cube.val) & self.on_bitmap & ~other_bitmap
+        if not essential:
+            return None
         
-        # Try removing each literal
-        for i in range(self.num_variables):
-            if current_cube.representation[i] != '-':
-                # Try making this position don't care
-                test_repr = (current_cube.representation[:i] + '-' + 
-                           current_cube.representation[i+1:])
-                test_cube = Cube(test_repr)
-                
-                # Check if reduction maintains coverage
-                other_cubes = [c for c in cover.cubes if c != cube]
-                if self._maintains_coverage(test_cube, other_cubes):
-                    current_cube = test_cube
+        care, val = cube.care, cube.val
         
-        return current_cube
-    
-    def _maintains_coverage(self, reduced_cube: Cube, other_cubes: List[Cube]) -> bool:
-        """
-        Check if reducing a cube maintains proper coverage
+        # Add a literal for every free position on which all of the
+        # essential minterms agree
+        for b in range(self.num_variables):
+            bit = 1 << b
+            if not care & bit:
+                if not essential & self.axis_masks[b]:
+                    care |= bit
+                elif not essential & ~self.axis_masks[b]:
+                    care |= bit
+                    val |= bit
         
-        Args:
-            reduced_cube: Proposed reduced cube
-            other_cubes: Other cubes in cover
-            
-        Returns:
-            True if coverage is maintained
-        """
-        # This is a simplified check
-        # In full Espresso, this would verify that all originally covered
-        # minterms are still covered after reduction
-        return True
+        return Cube.from_masks(care, val, self.num_variables)
     
     def _cover_to_expression(self, cover: Cover) -> str:
         """
@@ -519,25 +647,26 @@ class EspressoAlgorithm:
         Returns:
             Formatted string representation
         """
-        result = f"\n{title}:\n"
-        result += "=" * (len(title) + 1) + "\n"
+        lines = ["", f"{title}:", "=" * (len(title) + 1)]
         
         if not cover.cubes:
-            result += "Empty cover\n"
-            return result
+            lines.append("Empty cover")
+            return "\n".join(lines) + "\n"
         
-        result += f"{'Cube':<15} {'Expression':<20} {'Literals':<10}\n"
-        result += "-" * 45 + "\n"
+        lines.append(f"{'Cube':<15} {'Expression':<20} {'Literals':<10}")
+        lines.append("-" * 45)
         
-        for cube in cover.cubes:
-            expr = cube.to_expression(self.variables)
-            literals = cube.literal_count()
-            result += f"{cube.representation:<15} {expr:<20} {literals:<10}\n"
+        lines.extend(
+            f"{cube.representation:<15} {cube.to_expression(self.variables):<20} "
+            f"{cube.literal_count():<10}"
+            for cube in cover.cubes
+        )
         
-        result += f"\nTotal cubes: {cover.size()}\n"
-        result += f"Total literals: {cover.literal_count()}\n"
+        lines.append("")
+        lines.append(f"Total cubes: {cover.size()}")
+        lines.append(f"Total literals: {cover.literal_count()}")
         
-        return result
+        return "\n".join(lines) + "\n"
     
     def display_algorithm_trace(self, cover: Cover) -> str:
         """
@@ -549,22 +678,21 @@ class EspressoAlgorithm:
         Returns:
             Trace of algorithm steps
         """
-        trace = "Espresso Algorithm Trace\n"
-        trace += "=" * 30 + "\n"
+        sections = ["Espresso Algorithm Trace\n", "=" * 30 + "\n"]
         
-        trace += self.display_cover(cover, "Initial Cover")
+        sections.append(self.display_cover(cover, "Initial Cover"))
         
         # Show one iteration of the algorithm
         expanded = self._expand(cover)
-        trace += self.display_cover(expanded, "After EXPAND")
+        sections.append(self.display_cover(expanded, "After EXPAND"))
         
         irredundant = self._irredundant(expanded)
-        trace += self.display_cover(irredundant, "After IRREDUNDANT")
+        sections.append(self.display_cover(irredundant, "After IRREDUNDANT"))
         
         reduced = self._reduce(irredundant)
-        trace += self.display_cover(reduced, "After REDUCE")
+        sections.append(self.display_cover(reduced, "After REDUCE"))
         
-        return trace
+        return "".join(sections)
 
 
 def test_espresso_algorithm():
@@ -3,10 +3,55 @@ Karnaugh Map Algorithm
 Boolean expression simplification using K-Maps
 """
 
+import functools
+import heapq
 import itertools
+import operator
+from collections import defaultdict
 from typing import List, Dict, Tuple, Set, Optional
 
 
+def _combine_groups(masks: List[int], vals: List[int]) -> Tuple[List[int], List[int], List[bool]]:
+    """
+    Run one Quine-McCluskey combining pass over (mask, value) groups
+    
+    Groups are bucketed by the popcount of their value. Two groups can only
+    merge if they share a mask and their values differ in exactly one bit,
+    so only neighbouring buckets need to be compared.
+    
+    Args:
+        masks: Varying-bit masks of the current groups
+        vals: Fixed-bit values of the current groups
+        
+    Returns:
+        Tuple of (new masks, new values, per-group combined flags)
+    """
+    combined = [False] * len(masks)
+    seen = {}
+    
+    buckets = defaultdict(list)
+    for index, value in enumerate(vals):
+        buckets[value.bit_count()].append(index)
+    
+    for ones, lower in buckets.items():
+        upper = buckets.get(ones + 1)
+        if not upper:
+            continue
+        for i in lower:
+            mask = masks[i]
+            value = vals[i]
+            for j in upper:
+                if masks[j] != mask:
+                    continue
+                diff = value ^ vals[j]
+                # Adjacent groups differ in exactly one fixed bit
+                if not diff & (diff - 1):
+                    seen.setdefault((mask | diff, value), None)
+                    combined[i] = combined[j] = True
+    
+    return [m for m, _ in seen], [v for _, v in seen], combined
+
+
 class KarnaughMap:
     """
     Karnaugh Map implementation for Boolean function simplification.
@@ -28,9 +73,19 @@ class KarnaughMap:
         self.num_variables = num_variables
         self.variables = [f'A{i}' for i in range(num_variables)]
         self.size = 2 ** num_variables
-        self.kmap = {}
+        # Single-bit masks, ordered from the first (most significant) variable
+        self.bit_masks = tuple(1 << (num_variables - 1 - i) for i in range(num_variables))
+        # Zero-padded binary string of every cell index
+        binary_format = f'0{num_variables}b'
+        self.binary_strings = [format(i, binary_format) for i in range(self.size)]
+        # Bit i is set iff minterm i is in the function
+        self.minterm_mask = 0
         self.minterms = set()
+        # Minterms in ascending order, shared by the implicant searches
+        self.sorted_minterms = []
         self.maxterms = set()
+        # Cache of implicant strings keyed by (variable names, minterm set)
+        self.term_cache = {}
         
         # Gray code sequences for different map sizes
         self.gray_codes = {
@@ -47,11 +102,15 @@ class KarnaughMap:
             minterms: List of minterm indices where function = 1
         """
         self.minterms = set(minterms)
+        self.sorted_minterms = sorted(self.minterms)
         self.maxterms = set(range(self.size)) - self.minterms
         
         # Fill K-map
-        for i in range(self.size):
-            self.kmap[i] = 1 if i in self.minterms else 0
+        mask = 0
+        for minterm in self.minterms:
+            if 0 <= minterm < self.size:
+                mask |= 1 << minterm
+        self.minterm_mask = mask
     
     def set_function_from_truth_table(self, truth_table: List[int]) -> None:
         """
@@ -63,11 +122,20 @@ class KarnaughMap:
         if len(truth_table) != self.size:
             raise ValueError(f"Truth table must have {self.size} entries")
         
-        self.minterms = {i for i, val in enumerate(truth_table) if val == 1}
+        self.sorted_minterms = [i for i, val in enumerate(truth_table) if val == 1]
+        self.minterms = set(self.sorted_minterms)
         self.maxterms = {i for i, val in enumerate(truth_table) if val == 0}
         
-        for i, val in enumerate(truth_table):
-            self.kmap[i] = val
+        mask = 0
+        for minterm in self.minterms:
+            mask |= 1 << minterm
+        self.minterm_mask = mask
+    
+    @property
+    def kmap(self) -> List[int]:
+        """Cell values (0 or 1) indexed by minterm, derived from minterm_mask"""
+        mask = self.minterm_mask
+        return [(mask >> i) & 1 for i in range(self.size)]
     
     def get_adjacent_cells(self, cell: int) -> List[int]:
         """
@@ -79,17 +147,8 @@ class KarnaughMap:
         Returns:
             List of adjacent cell indices
         """
-        adjacent = []
-        cell_binary = format(cell, f'0{self.num_variables}b')
-        
-        for i in range(self.num_variables):
-            # Flip bit i
-            new_binary = list(cell_binary)
-            new_binary[i] = '0' if new_binary[i] == '1' else '1'
-            adjacent_cell = int(''.join(new_binary), 2)
-            adjacent.append(adjacent_cell)
-        
-        return adjacent
+        # Flip one variable bit at a time
+        return [cell ^ bit for bit in self.bit_masks]
     
     def find_prime_implicants(self) -> List[Set[int]]:
         """
@@ -105,51 +164,50 @@ class KarnaughMap:
         if self.num_variables == 3:
             return self._find_prime_implicants_3var()
         
-        # Start with individual minterms as initial groups
-        current_groups = [{minterm} for minterm in self.minterms]
-        prime_implicants = []
-        max_iterations = 10  # Prevent infinite loops
-        iteration = 0
-        
-        while current_groups and iteration < max_iterations:
-            next_groups = []
-            used_groups = set()
+        # Start with individual minterms as initial groups. A group is a
+        # (mask, value) pair: mask has a bit set for every variable that
+        # varies inside the group, value holds the fixed bits (0 under mask).
+        masks = [0] * len(self.sorted_minterms)
+        vals = self.sorted_minterms
+        # Insertion-ordered set of prime implicant groups
+        prime_implicants = {}
+        
+        # Each pass widens the groups by one variable, so the loop ends after
+        # at most num_variables passes once nothing combines any more
+        while masks:
+            next_masks, next_vals, combined = _combine_groups(masks, vals)
             
-            # Try to combine groups
-            for i, group1 in enumerate(current_groups):
-                if i in used_groups:
-                    continue
-                    
-                combined = False
-                for j in range(i + 1, len(current_groups)):
-                    if j in used_groups:
-                        continue
-                        
-                    group2 = current_groups[j]
-                    
-                    # Simple combination check - groups must be adjacent
-                    if self._can_combine_simple(group1, group2):
-                        combined_group = group1 | group2
-                        if combined_group not in next_groups:
-                            next_groups.append(combined_group)
-                        used_groups.add(i)
-                        used_groups.add(j)
-                        combined = True
-                        break
-                
-                # If group couldn't be combined, it's a prime implicant
-                if not combined and i not in used_groups:
-                    prime_implicants.append(group1)
+            # Groups that could not be combined are prime implicants
+            for mask, value, was_combined in zip(masks, vals, combined):
+                if not was_combined:
+                    prime_implicants[mask, value] = None
             
-            current_groups = next_groups
-            iteration += 1
+            masks, vals = next_masks, next_vals
         
-        # Add any remaining groups as prime implicants
-        for group in current_groups:
-            if group not in prime_implicants:
-                prime_implicants.append(group)
+        return [self._group_minterms(mask, value) for mask, value in prime_implicants]
+    
+    def _group_minterms(self, mask: int, value: int) -> Set[int]:
+        """
+        Expand a (mask, value) group into the set of minterms it covers
         
-        return prime_implicants
+        Args:
+            mask: Bits that vary inside the group
+            value: Fixed bits of the group
+            
+        Returns:
+            Set of minterm indices
+        """
+        minterms = set()
+        sub = mask
+        
+        # Enumerate every submask of mask
+        while True:
+            minterms.add(value | sub)
+            if sub == 0:
+                break
+            sub = (sub - 1) & mask
+        
+        return minterms
     
     def _find_prime_implicants_3var(self) -> List[Set[int]]:
         """Simplified prime implicant finding for 3 variables"""
@@ -157,7 +215,7 @@ class KarnaughMap:
         
         # Check for pairs first
         covered = set()
-        minterms_list = list(self.minterms)
+        minterms_list = self.sorted_minterms
         
         for i, m1 in enumerate(minterms_list):
             if m1 in covered:
@@ -166,44 +224,19 @@ class KarnaughMap:
                 if m2 in covered:
                     continue
                 # Check if they differ by exactly one bit
-                if bin(m1 ^ m2).count('1') == 1:
+                if (m1 ^ m2).bit_count() == 1:
                     prime_implicants.append({m1, m2})
                     covered.add(m1)
                     covered.add(m2)
                     break
         
         # Add uncovered minterms as individual prime implicants
-        for m in self.minterms:
+        for m in minterms_list:
             if m not in covered:
                 prime_implicants.append({m})
         
         return prime_implicants
     
-    def _can_combine_simple(self, group1: Set[int], group2: Set[int]) -> bool:
-        """
-        Simple check if two groups can be combined
-        
-        Args:
-            group1, group2: Sets of minterm indices
-            
-        Returns:
-            True if groups can be combined
-        """
-        # Groups must be same size and power of 2
-        if len(group1) != len(group2):
-            return False
-        
-        if len(group1) not in [1, 2, 4]:
-            return False
-        
-        # For single minterms, check if they differ by one bit
-        if len(group1) == 1 and len(group2) == 1:
-            m1 = list(group1)[0]
-            m2 = list(group2)[0]
-            return bin(m1 ^ m2).count('1') == 1
-        
-        return False
-    
     def find_essential_prime_implicants(self, prime_implicants: List[Set[int]]) -> Tuple[List[Set[int]], Set[int]]:
         """
         Find essential prime implicants using coverage analysis
@@ -215,17 +248,25 @@ class KarnaughMap:
             Tuple of (essential prime implicants, covered minterms)
         """
         essential = []
+        essential_indices = set()
         covered_minterms = set()
         
+        # Inverted index: minterm -> indices of the prime implicants covering it
+        covering = defaultdict(list)
+        for index, pi in enumerate(prime_implicants):
+            for minterm in pi:
+                covering[minterm].append(index)
+        
         # Find minterms covered by only one prime implicant
-        for minterm in self.minterms:
-            covering_implicants = [pi for pi in prime_implicants if minterm in pi]
+        for minterm in self.sorted_minterms:
+            covering_indices = covering[minterm]
             
-            if len(covering_implicants) == 1:
-                essential_pi = covering_implicants[0]
-                if essential_pi not in essential:
-                    essential.append(essential_pi)
-                    covered_minterms.update(essential_pi)
+            if len(covering_indices) == 1:
+                index = covering_indices[0]
+                if index not in essential_indices:
+                    essential_indices.add(index)
+                    essential.append(prime_implicants[index])
+                    covered_minterms.update(prime_implicants[index])
         
         return essential, covered_minterms
     
@@ -244,6 +285,21 @@ class KarnaughMap:
                 'cost': 0
             }
         
+        # Trivial functions: the constant 1 and a single minterm are their own
+        # only prime implicant
+        if self.minterm_mask == (1 << self.size) - 1 or len(self.minterms) == 1:
+            if len(self.minterms) == 1:
+                term = self._pi_to_string(self.minterms)
+            else:
+                term = "1"
+            return {
+                'simplified_expression': term,
+                'prime_implicants': [term],
+                'essential_prime_implicants': [term],
+                'final_prime_implicants': [term],
+                'cost': 1
+            }
+        
         # Find all prime implicants
         prime_implicants = self.find_prime_implicants()
         
@@ -282,26 +338,30 @@ class KarnaughMap:
         if not uncovered_minterms:
             return []
         
-        # Simple greedy approach - choose PI that covers most uncovered minterms
+        # Greedy approach - choose PI that covers most uncovered minterms.
+        # Heap keys are upper bounds on coverage (coverage only shrinks), so
+        # a popped entry whose recomputed coverage still matches is the best
+        # choice; ties go to the earliest PI as in a linear scan.
         selected = []
         remaining = uncovered_minterms.copy()
+        heap = [(-len(pi & remaining), index) for index, pi in enumerate(prime_implicants)]
+        heapq.heapify(heap)
         
-        while remaining:
-            best_pi = None
-            best_coverage = 0
+        while remaining and heap:
+            key, index = heapq.heappop(heap)
+            pi = prime_implicants[index]
+            coverage = len(pi & remaining)
             
-            for pi in prime_implicants:
-                if pi not in selected:
-                    coverage = len(pi & remaining)
-                    if coverage > best_coverage:
-                        best_coverage = coverage
-                        best_pi = pi
+            if coverage == 0:
+                # Nothing left to cover - drop the entry for good
+                continue
+            if coverage != -key:
+                # Stale entry - reinsert with its current coverage
+                heapq.heappush(heap, (-coverage, index))
+                continue
             
-            if best_pi:
-                selected.append(best_pi)
-                remaining -= best_pi
-            else:
-                break
+            selected.append(pi)
+            remaining -= pi
         
         return selected
     
@@ -318,40 +378,38 @@ class KarnaughMap:
         if not prime_implicant:
             return ""
         
-        # Find the pattern (which bits are constant)
-        pi_list = list(prime_implicant)
-        if len(pi_list) == 1:
-            # Single minterm
-            minterm = pi_list[0]
-            binary = format(minterm, f'0{self.num_variables}b')
-            term = ""
-            for i, bit in enumerate(binary):
-                if bit == '1':
-                    term += self.variables[i]
-                else:
-                    term += self.variables[i] + "'"
-            return term
-        
-        # Multiple minterms - find don't care positions
-        first_binary = format(pi_list[0], f'0{self.num_variables}b')
-        pattern = list(first_binary)
-        
-        for minterm in pi_list[1:]:
-            binary = format(minterm, f'0{self.num_variables}b')
-            for i, bit in enumerate(binary):
-                if pattern[i] != bit:
-                    pattern[i] = '-'  # Don't care
-        
-        # Generate term from pattern
-        term = ""
-        for i, bit in enumerate(pattern):
-            if bit == '1':
-                term += self.variables[i]
-            elif bit == '0':
-                term += self.variables[i] + "'"
-            # Skip don't cares
-        
-        return term if term else "1"
+        # Variable names may be reassigned after construction, so they are
+        # part of the key
+        key = (tuple(self.variables), frozenset(prime_implicant))
+        term = self.term_cache.get(key)
+        if term is None:
+            term = self.term_cache[key] = self._build_term(prime_implicant)
+        return term
+    
+    def _build_term(self, prime_implicant: Set[int]) -> str:
+        """
+        Build the product term of a non-empty prime implicant
+        
+        Args:
+            prime_implicant: Set of minterm indices
+            
+        Returns:
+            Product term, or "1" if every variable is a don't care
+        """
+        # Bits that are 1 (resp. 0) in every minterm are the fixed literals;
+        # the rest are don't cares
+        ones = functools.reduce(operator.and_, prime_implicant)
+        zeros = ~functools.reduce(operator.or_, prime_implicant) & (self.size - 1)
+        
+        # Generate term from the fixed bits
+        term = []
+        for variable, bit in zip(self.variables, self.bit_masks):
+            if ones & bit:
+                term.append(variable)
+            elif zeros & bit:
+                term.append(variable + "'")
+        
+        return "".join(term) or "1"
     
     def _generate_expression(self, prime_implicants: List[Set[int]]) -> str:
         """
@@ -394,38 +452,53 @@ class KarnaughMap:
     
     def _display_2var_kmap(self) -> str:
         """Display 2-variable K-map"""
-        result = f"\nK-Map for {self.variables[0]}, {self.variables[1]}:\n"
-        result += f"    {self.variables[1]}'\t{self.variables[1]}\n"
-        result += f"{self.variables[0]}'\t{self.kmap[0]}\t{self.kmap[1]}\n"
-        result += f"{self.variables[0]}\t{self.kmap[2]}\t{self.kmap[3]}\n"
-        return result
+        kmap = self.kmap
+        a, b = self.variables[:2]
+        lines = [
+            "",
+            f"K-Map for {a}, {b}:",
+            f"    {b}'\t{b}",
+            f"{a}'\t{kmap[0]}\t{kmap[1]}",
+            f"{a}\t{kmap[2]}\t{kmap[3]}",
+        ]
+        return "\n".join(lines) + "\n"
     
     def _display_3var_kmap(self) -> str:
         """Display 3-variable K-map"""
-        result = f"\nK-Map for {self.variables[0]}, {self.variables[1]}, {self.variables[2]}:\n"
-        result += f"\\{self.variables[1]}{self.variables[2]}\t00\t01\t11\t10\n"
-        result += f"{self.variables[0]}'  \t{self.kmap[0]}\t{self.kmap[1]}\t{self.kmap[3]}\t{self.kmap[2]}\n"
-        result += f"{self.variables[0]}   \t{self.kmap[4]}\t{self.kmap[5]}\t{self.kmap[7]}\t{self.kmap[6]}\n"
-        return result
+        kmap = self.kmap
+        a, b, c = self.variables[:3]
+        lines = [
+            "",
+            f"K-Map for {a}, {b}, {c}:",
+            f"\\{b}{c}\t00\t01\t11\t10",
+            f"{a}'  \t{kmap[0]}\t{kmap[1]}\t{kmap[3]}\t{kmap[2]}",
+            f"{a}   \t{kmap[4]}\t{kmap[5]}\t{kmap[7]}\t{kmap[6]}",
+        ]
+        return "\n".join(lines) + "\n"
     
     def _display_4var_kmap(self) -> str:
         """Display 4-variable K-map"""
-        result = f"\nK-Map for {self.variables[0]}, {self.variables[1]}, {self.variables[2]}, {self.variables[3]}:\n"
-        result += f"\\{self.variables[2]}{self.variables[3]}\t00\t01\t11\t10\n"
-        result += f"{self.variables[0]}'{self.variables[1]}'\t{self.kmap[0]}\t{self.kmap[1]}\t{self.kmap[3]}\t{self.kmap[2]}\n"
-        result += f"{self.variables[0]}'{self.variables[1]} \t{self.kmap[4]}\t{self.kmap[5]}\t{self.kmap[7]}\t{self.kmap[6]}\n"
-        result += f"{self.variables[0]} {self.variables[1]} \t{self.kmap[12]}\t{self.kmap[13]}\t{self.kmap[15]}\t{self.kmap[14]}\n"
-        result += f"{self.variables[0]} {self.variables[1]}'\t{self.kmap[8]}\t{self.kmap[9]}\t{self.kmap[11]}\t{self.kmap[10]}\n"
-        return result
+        kmap = self.kmap
+        a, b, c, d = self.variables[:4]
+        lines = [
+            "",
+            f"K-Map for {a}, {b}, {c}, {d}:",
+            f"\\{c}{d}\t00\t01\t11\t10",
+            f"{a}'{b}'\t{kmap[0]}\t{kmap[1]}\t{kmap[3]}\t{kmap[2]}",
+            f"{a}'{b} \t{kmap[4]}\t{kmap[5]}\t{kmap[7]}\t{kmap[6]}",
+            f"{a} {b} \t{kmap[12]}\t{kmap[13]}\t{kmap[15]}\t{kmap[14]}",
+            f"{a} {b}'\t{kmap[8]}\t{kmap[9]}\t{kmap[11]}\t{kmap[10]}",
+        ]
+        return "\n".join(lines) + "\n"
     
     def _display_generic_kmap(self) -> str:
         """Display generic K-map for >4 variables"""
-        result = f"\nK-Map for {', '.join(self.variables)}:\n"
-        result += "Minterm\tValue\n"
-        for i in range(self.size):
-            binary = format(i, f'0{self.num_variables}b')
-            result += f"{i}({binary})\t{self.kmap[i]}\n"
-        return result
+        kmap = self.kmap
+        lines = ["", f"K-Map for {', '.join(self.variables)}:", "Minterm\tValue"]
+        lines.extend(
+            f"{i}({binary})\t{kmap[i]}" for i, binary in enumerate(self.binary_strings)
+        )
+        return "\n".join(lines) + "\n"
 
 
 # Example usage and test functions
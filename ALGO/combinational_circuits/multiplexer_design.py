@@ -5,7 +5,129 @@ Implement any Boolean logic function using multiplexers
 
 from typing import List, Dict, Tuple, Optional, Union, Set
 import itertools
-import math
+import json
+
+
+# Non-constant single-variable data inputs, keyed by their 2-bit truth table
+_ONE_VAR_EXPR_TEMPLATE = {
+    0b01: "{0}'",
+    0b10: "{0}",
+}
+
+# Two-variable data inputs keyed by their 4-bit truth table (bit m = minterm m);
+# {0} and {1} are the two variable names
+_TWO_VAR_EXPR_TEMPLATE = {
+    0b0001: "{0}'{1}'",
+    0b0010: "{0}'{1}",
+    0b0100: "{0}{1}'",
+    0b1000: "{0}{1}",
+    0b0011: "{0}'",
+    0b1100: "{0}",
+    0b0101: "{1}'",
+    0b1010: "{1}",
+    0b1001: "{0}'{1}' + {0}{1}",
+    0b0110: "{0}'{1} + {0}{1}'",
+}
+
+
+# Maps 0/1 bytes to the ASCII digits int() parses in base 2
+_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def _pack_truth_table(values: Union[List[int], bytes, bytearray]) -> Optional[int]:
+    """
+    Pack a sequence of 0/1 values into an integer truth table
+    
+    Args:
+        values: Truth table values, entry i being f(i)
+    
+    Returns:
+        Integer with bit i set iff values[i] is 1, or None if the values are
+        not all 0/1 integers (the caller then falls back to a Python loop)
+    """
+    try:
+        data = bytes(values)
+    except (TypeError, ValueError):
+        return None
+    if data.translate(None, b'\x00\x01'):
+        return None
+    if not data:
+        return 0
+    # Reverse so that entry 0 becomes the least significant digit
+    return int(data[::-1].translate(_BIT_CHARS), 2)
+
+
+class _MuxNode:
+    """
+    Node of a Shannon multiplexer tree.
+    
+    Nodes use __slots__ and an integer kind instead of per-node dicts. The
+    read-only mapping interface with the old dict keys ('type', 'value',
+    'variable', 'select', 'input_0', 'input_1', 'depth') keeps existing
+    readers working; to_dict() gives plain nested dicts, e.g. for JSON.
+    """
+    
+    __slots__ = ('kind', 'value', 'variable', 'select', 'input_0', 'input_1', 'depth')
+    
+    CONSTANT = 0
+    VARIABLE = 1
+    MUX = 2
+    
+    _TYPE_NAMES = ('constant', 'variable', 'mux')
+    _FIELDS = (
+        ('value', 'depth'),
+        ('variable', 'depth'),
+        ('select', 'input_0', 'input_1', 'depth'),
+    )
+    
+    def __init__(self, kind: int, depth: int, value: int = None, variable: str = None,
+                 select: str = None, input_0: '_MuxNode' = None, input_1: '_MuxNode' = None):
+        self.kind = kind
+        self.value = value
+        self.variable = variable
+        self.select = select
+        self.input_0 = input_0
+        self.input_1 = input_1
+        self.depth = depth
+    
+    def __contains__(self, key: str) -> bool:
+        return key == 'type' or key in self._FIELDS[self.kind]
+    
+    def __getitem__(self, key: str):
+        if key == 'type':
+            return self._TYPE_NAMES[self.kind]
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self) -> int:
+        return 1 + len(self._FIELDS[self.kind])
+    
+    def keys(self) -> Tuple[str, ...]:
+        """Node keys, in the order of the old dict form"""
+        return ('type',) + self._FIELDS[self.kind]
+    
+    def items(self) -> List[Tuple[str, object]]:
+        """(key, value) pairs of the node; children stay _MuxNode objects"""
+        return [(key, self[key]) for key in self.keys()]
+    
+    def get(self, key: str, default=None):
+        """Dict-style get with the old node keys"""
+        return self[key] if key in self else default
+    
+    def to_dict(self) -> Dict:
+        """Convert the subtree rooted here to the nested dict form"""
+        result = {'type': self._TYPE_NAMES[self.kind]}
+        for field in self._FIELDS[self.kind]:
+            value = getattr(self, field)
+            result[field] = value.to_dict() if isinstance(value, _MuxNode) else value
+        return result
+    
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
 
 
 class MultiplexerDesign:
@@ -27,29 +149,61 @@ class MultiplexerDesign:
         """
         self.num_variables = num_variables
         self.variables = [f'A{i}' for i in range(num_variables)]
-        self.function_truth_table = {}
-        self.minterms = set()
-    
-    def set_function(self, truth_table: Union[List[int], Dict[int, int]] = None, 
+        # Truth table packed into one integer: bit i holds f(i)
+        self.tt_mask = 0
+        # Minterm offset tables keyed by the tuple of variable indices
+        self.offset_cache = {}
+        # Minterm -> (select combination, data-input bit) tables keyed by
+        # (select variables, remaining variables)
+        self.position_cache = {}
+        # Finished designs for the current function
+        self.design_cache = {}
+    
+    def set_function(self, truth_table: Union[List[int], Dict[int, int], bytes, bytearray] = None, 
                     minterms: List[int] = None) -> None:
         """
         Set the Boolean function to implement
         
         Args:
-            truth_table: Truth table as list or dict
+            truth_table: Truth table as list, dict, bytes or bytearray
             minterms: List of minterms where function = 1
         """
+        mask = 0
         if truth_table is not None:
-            if isinstance(truth_table, list):
-                self.function_truth_table = {i: val for i, val in enumerate(truth_table)}
+            packed = None
+            if isinstance(truth_table, (bytes, bytearray, list)):
+                packed = _pack_truth_table(truth_table)
+            if packed is not None:
+                mask = packed
             else:
-                self.function_truth_table = truth_table
+                if isinstance(truth_table, dict):
+                    items = truth_table.items()
+                else:
+                    items = enumerate(truth_table)
+                for i, val in items:
+                    if val == 1:
+                        mask |= 1 << i
         elif minterms is not None:
-            self.function_truth_table = {}
-            for i in range(2 ** self.num_variables):
-                self.function_truth_table[i] = 1 if i in minterms else 0
+            for minterm in minterms:
+                if 0 <= minterm < 2 ** self.num_variables:
+                    mask |= 1 << minterm
+        else:
+            return
         
-        self.minterms = {i for i, val in self.function_truth_table.items() if val == 1}
+        self.tt_mask = mask
+        self.design_cache = {}
+    
+    @property
+    def minterms(self) -> Set[int]:
+        """Minterms where the function is 1, derived from tt_mask"""
+        mask = self.tt_mask
+        return {i for i in range(mask.bit_length()) if (mask >> i) & 1}
+    
+    @property
+    def function_truth_table(self) -> Dict[int, int]:
+        """Truth table as a {minterm: value} dict, derived from tt_mask"""
+        mask = self.tt_mask
+        return {i: (mask >> i) & 1 for i in range(2 ** self.num_variables)}
     
     def design_single_mux(self, select_variables: List[int] = None) -> Dict:
         """
@@ -60,13 +214,21 @@ class MultiplexerDesign:
                             If None, uses first log2(n) variables
         
         Returns:
-            Dictionary describing the multiplexer implementation
+            Dictionary describing the multiplexer implementation. Designs are
+            cached until the next set_function call, so repeated calls return
+            the same dictionary.
         """
         if not select_variables:
             # Use first log2(num_variables) variables as select lines
-            num_select_vars = max(1, int(math.log2(self.num_variables)))
+            num_select_vars = max(1, self.num_variables.bit_length() - 1)
             select_variables = list(range(min(num_select_vars, self.num_variables)))
         
+        # Variable names are part of the key since callers may rename them
+        key = ('single_mux', tuple(self.variables), tuple(select_variables))
+        cached = self.design_cache.get(key)
+        if cached is not None:
+            return cached
+        
         num_select = len(select_variables)
         num_data_inputs = 2 ** num_select
         remaining_variables = [i for i in range(self.num_variables) if i not in select_variables]
@@ -74,12 +236,16 @@ class MultiplexerDesign:
         # Generate data inputs for each select combination
         data_inputs = {}
         
-        for select_combo in range(num_data_inputs):
-            # For this select combination, determine the data input
-            data_input = self._compute_data_input(select_combo, select_variables, remaining_variables)
-            data_inputs[select_combo] = data_input
+        if not remaining_variables:
+            # No remaining variables, data inputs are constants
+            for select_combo in range(num_data_inputs):
+                data_inputs[select_combo] = (self.tt_mask >> select_combo) & 1
+        else:
+            data_masks = self._compute_data_masks(select_variables, remaining_variables)
+            for select_combo, data_mask in enumerate(data_masks):
+                data_inputs[select_combo] = self._analyze_data_function(data_mask, remaining_variables)
         
-        return {
+        design = {
             'type': 'single_mux',
             'select_variables': [self.variables[i] for i in select_variables],
             'select_variable_indices': select_variables,
@@ -88,119 +254,124 @@ class MultiplexerDesign:
             'mux_size': f"{num_data_inputs}:1",
             'implementation_cost': self._calculate_single_mux_cost(data_inputs, remaining_variables)
         }
+        self.design_cache[key] = design
+        return design
     
-    def _compute_data_input(self, select_combo: int, select_vars: List[int], 
-                          remaining_vars: List[int]) -> Union[str, int]:
+    def _compute_data_masks(self, select_vars: List[int], remaining_vars: List[int]) -> List[int]:
         """
-        Compute the data input for a specific select combination
+        Compute the truth tables of all data inputs in one pass
+        
+        Every minterm of the function belongs to exactly one select
+        combination and one remaining-variable combination. Scattering the
+        set bits of tt_mask through a cached position table fills every
+        data input at once, touching only the minterms where f = 1.
         
         Args:
-            select_combo: Select line combination value
             select_vars: Indices of select variables
             remaining_vars: Indices of remaining variables
         
         Returns:
-            Data input value (0, 1, or expression)
+            List indexed by select combination of data-input truth tables,
+            bit c of each holding the value for remaining combination c
         """
-        if not remaining_vars:
-            # No remaining variables, data input is constant
-            return self.function_truth_table.get(select_combo, 0)
-        
-        # Build truth table for this data input as function of remaining variables
-        data_truth_table = {}
-        num_remaining = len(remaining_vars)
+        key = (tuple(select_vars), tuple(remaining_vars))
+        positions = self.position_cache.get(key)
+        if positions is None:
+            positions = [None] * (2 ** self.num_variables)
+            remaining_offsets = self._minterm_offsets(remaining_vars)
+            for select_combo, select_offset in enumerate(self._minterm_offsets(select_vars)):
+                for remaining_combo, offset in enumerate(remaining_offsets):
+                    positions[select_offset | offset] = (select_combo, 1 << remaining_combo)
+            self.position_cache[key] = positions
+        
+        data_masks = [0] * (2 ** len(select_vars))
+        mask = self.tt_mask & ((1 << len(positions)) - 1)
+        while mask:
+            low_bit = mask & -mask
+            position = positions[low_bit.bit_length() - 1]
+            if position is not None:
+                data_masks[position[0]] |= position[1]
+            mask ^= low_bit
+        
+        return data_masks
+    
+    def _minterm_offsets(self, var_indices: List[int]) -> List[int]:
+        """
+        Map every combination of the given variables to its minterm bits
         
-        for remaining_combo in range(2 ** num_remaining):
-            # Construct full minterm
-            full_minterm = 0
-            
-            # Set select variable bits
-            for i, var_idx in enumerate(select_vars):
-                if (select_combo >> i) & 1:
-                    full_minterm |= (1 << (self.num_variables - 1 - var_idx))
-            
-            # Set remaining variable bits
-            for i, var_idx in enumerate(remaining_vars):
-                if (remaining_combo >> i) & 1:
-                    full_minterm |= (1 << (self.num_variables - 1 - var_idx))
-            
-            output = self.function_truth_table.get(full_minterm, 0)
-            data_truth_table[remaining_combo] = output
+        Args:
+            var_indices: Variable indices; bit i of a combination sets var_indices[i]
         
-        # Analyze the data truth table
-        return self._analyze_data_function(data_truth_table, remaining_vars)
-    
-    def _analyze_data_function(self, truth_table: Dict[int, int], variables: List[int]) -> Union[str, int]:
+        Returns:
+            List whose entry c is the full-minterm bit pattern of combination c
+        """
+        key = tuple(var_indices)
+        offsets = self.offset_cache.get(key)
+        if offsets is None:
+            offsets = [0]
+            for var_idx in var_indices:
+                bit = 1 << (self.num_variables - 1 - var_idx)
+                offsets += [offset | bit for offset in offsets]
+            self.offset_cache[key] = offsets
+        return offsets
+    
+    def _analyze_data_function(self, truth_mask: int, variables: List[int]) -> Union[str, int]:
         """
         Analyze data input function and return simplified form
         
         Args:
-            truth_table: Truth table for data input
+            truth_mask: Truth table for data input, bit i holding f(i)
             variables: Variable indices for this data input
         
         Returns:
             Simplified expression or constant value
         """
-        values = list(truth_table.values())
-        
         # Check for constant functions
-        if all(v == 0 for v in values):
+        if truth_mask == 0:
             return 0
-        if all(v == 1 for v in values):
+        if truth_mask == (1 << (1 << len(variables))) - 1:
             return 1
         
         # Check for simple functions
-        minterms = [i for i, val in truth_table.items() if val == 1]
-        
         if len(variables) == 1:
-            var_name = self.variables[variables[0]]
-            if minterms == [0]:
-                return f"{var_name}'"
-            elif minterms == [1]:
-                return var_name
-        elif len(variables) == 2:
+            return _ONE_VAR_EXPR_TEMPLATE[truth_mask].format(self.variables[variables[0]])
+        
+        if len(variables) == 2:
             var_names = [self.variables[variables[i]] for i in range(2)]
-            return self._two_variable_expression(minterms, var_names)
+            return self._two_variable_expression(truth_mask, var_names)
         
         # For more complex functions, return minterm expression
+        minterms = [i for i in range(truth_mask.bit_length()) if (truth_mask >> i) & 1]
         return self._minterms_to_expression(minterms, variables)
     
-    def _two_variable_expression(self, minterms: List[int], var_names: List[str]) -> str:
-        """Generate expression for 2-variable function"""
-        if not minterms:
+    def _two_variable_expression(self, truth_mask: int, var_names: List[str]) -> str:
+        """Generate expression for 2-variable function given its 4-bit truth table"""
+        if truth_mask == 0:
             return "0"
-        if len(minterms) == 4:
+        if truth_mask == 0b1111:
             return "1"
         
-        expressions = {
-            frozenset([0]): f"{var_names[0]}'{var_names[1]}'",
-            frozenset([1]): f"{var_names[0]}'{var_names[1]}",
-            frozenset([2]): f"{var_names[0]}{var_names[1]}'",
-            frozenset([3]): f"{var_names[0]}{var_names[1]}",
-            frozenset([0, 1]): f"{var_names[0]}'",
-            frozenset([2, 3]): f"{var_names[0]}",
-            frozenset([0, 2]): f"{var_names[1]}'",
-            frozenset([1, 3]): f"{var_names[1]}",
-            frozenset([0, 3]): f"{var_names[0]}'{var_names[1]}' + {var_names[0]}{var_names[1]}",
-            frozenset([1, 2]): f"{var_names[0]}'{var_names[1]} + {var_names[0]}{var_names[1]}'"
-        }
+        template = _TWO_VAR_EXPR_TEMPLATE.get(truth_mask)
+        if template is not None:
+            return template.format(*var_names)
         
-        return expressions.get(frozenset(minterms), self._minterms_to_expression(minterms, [0, 1]))
+        minterms = [i for i in range(4) if (truth_mask >> i) & 1]
+        return self._minterms_to_expression(minterms, [0, 1])
     
     def _minterms_to_expression(self, minterms: List[int], variables: List[int]) -> str:
         """Convert minterms to Boolean expression"""
         if not minterms:
             return "0"
         
-        terms = []
-        for minterm in minterms:
-            term = ""
-            for i, var_idx in enumerate(variables):
-                if (minterm >> i) & 1:
-                    term += self.variables[var_idx]
-                else:
-                    term += self.variables[var_idx] + "'"
-            terms.append(term)
+        # Literal strings per position, built once per call rather than per minterm
+        positive = [self.variables[var_idx] for var_idx in variables]
+        negative = [name + "'" for name in positive]
+        literals = list(zip(negative, positive))
+        
+        terms = [
+            "".join(pair[(minterm >> i) & 1] for i, pair in enumerate(literals))
+            for minterm in minterms
+        ]
         
         return " + ".join(terms)
     
@@ -223,86 +394,110 @@ class MultiplexerDesign:
             tree_structure: Type of tree ("balanced", "chain", "shannon")
         
         Returns:
-            Dictionary describing the multiplexer tree
+            Dictionary describing the multiplexer tree (cached like
+            design_single_mux)
         """
+        key = ('mux_tree', tuple(self.variables), tree_structure)
+        cached = self.design_cache.get(key)
+        if cached is not None:
+            return cached
+        
         if tree_structure == "shannon":
-            return self._design_shannon_mux_tree()
+            design = self._design_shannon_mux_tree()
         elif tree_structure == "balanced":
-            return self._design_balanced_mux_tree()
+            design = self._design_balanced_mux_tree()
         elif tree_structure == "chain":
-            return self._design_chain_mux_tree()
+            design = self._design_chain_mux_tree()
         else:
             raise ValueError(f"Unknown tree structure: {tree_structure}")
+        
+        self.design_cache[key] = design
+        return design
     
     def _design_shannon_mux_tree(self) -> Dict:
         """Design multiplexer tree using Shannon expansion"""
-        tree = self._recursive_shannon_expansion(self.minterms, self.num_variables, 0)
+        # Identical cofactors reached along different paths share one subtree
+        cache = {}
+        full_tt = self.tt_mask & ((1 << (1 << self.num_variables)) - 1)
+        tree = self._shannon_expansion(full_tt, self.num_variables, cache)
+        muxes, constants, variables, depth = self._calculate_tree_metrics(tree)
         
         return {
             'type': 'shannon_mux_tree',
             'tree_structure': tree,
-            'implementation_cost': self._calculate_tree_cost(tree),
-            'depth': self._calculate_tree_depth(tree),
-            'mux_count': self._count_muxes_in_tree(tree)
+            'implementation_cost': {'muxes': muxes, 'constants': constants, 'variables': variables},
+            'depth': depth,
+            'mux_count': muxes
         }
     
-    def _recursive_shannon_expansion(self, current_minterms: Set[int], 
-                                   remaining_vars: int, depth: int) -> Dict:
-        """Recursive Shannon expansion for multiplexer tree"""
-        if remaining_vars == 0:
-            # Leaf node - constant value
-            return {
-                'type': 'constant',
-                'value': 1 if current_minterms else 0,
-                'depth': depth
-            }
-        
-        if remaining_vars == 1:
-            # Single variable - direct implementation
-            var_name = self.variables[self.num_variables - remaining_vars]
+    def _shannon_expansion(self, sub_tt: int, remaining_vars: int,
+                           cache: Dict[Tuple[int, int], _MuxNode]) -> _MuxNode:
+        """
+        Shannon expansion for multiplexer tree
+        
+        Nodes are built bottom-up from an explicit stack, so the expansion
+        depth is not bounded by Python's recursion limit.
+        
+        Args:
+            sub_tt: Truth table of the function, bit m holding f(m)
+            remaining_vars: Number of variables the function depends on
+            cache: Nodes already built, keyed by (sub_tt, remaining_vars)
+        
+        Returns:
+            Root node of the tree
+        """
+        stack = [(sub_tt, remaining_vars, False)]
+        
+        while stack:
+            tt, num_vars, children_ready = stack.pop()
+            key = (tt, num_vars)
+            if key in cache:
+                continue
             
-            # Check minterms for this variable
-            has_0 = any((minterm >> (remaining_vars - 1)) & 1 == 0 for minterm in current_minterms)
-            has_1 = any((minterm >> (remaining_vars - 1)) & 1 == 1 for minterm in current_minterms)
+            depth = self.num_variables - num_vars
+            if num_vars <= 1:
+                cache[key] = self._shannon_leaf(tt, num_vars, depth)
+                continue
             
-            if has_0 and has_1:
-                return {'type': 'constant', 'value': 1, 'depth': depth}
-            elif has_1:
-                return {'type': 'variable', 'variable': var_name, 'depth': depth}
-            elif has_0:
-                return {'type': 'variable', 'variable': var_name + "'", 'depth': depth}
+            # Split the truth table on the expansion variable (the MSB): the
+            # low half holds the minterms with the variable at 0, the high
+            # half those at 1. tt is exactly 2**num_vars bits wide, so the
+            # high half needs no mask.
+            half = 1 << (num_vars - 1)
+            key_0 = (tt & ((1 << half) - 1), num_vars - 1)
+            key_1 = (tt >> half, num_vars - 1)
+            
+            if children_ready:
+                cache[key] = _MuxNode(_MuxNode.MUX, depth, select=self.variables[depth],
+                                      input_0=cache[key_0], input_1=cache[key_1])
             else:
-                return {'type': 'constant', 'value': 0, 'depth': depth}
-        
-        # Choose variable to expand on (use MSB)
-        expand_var_idx = self.num_variables - remaining_vars
-        expand_var = self.variables[expand_var_idx]
+                stack.append((tt, num_vars, True))
+                stack.append((key_1[0], key_1[1], False))
+                stack.append((key_0[0], key_0[1], False))
         
-        # Split minterms based on expansion variable
-        minterms_0 = set()  # Variable = 0
-        minterms_1 = set()  # Variable = 1
+        return cache[(sub_tt, remaining_vars)]
+    
+    def _shannon_leaf(self, sub_tt: int, remaining_vars: int, depth: int) -> _MuxNode:
+        """Build a Shannon tree leaf for a function of at most one variable"""
+        if remaining_vars == 0:
+            # Leaf node - constant value
+            return _MuxNode(_MuxNode.CONSTANT, depth, value=1 if sub_tt else 0)
         
-        for minterm in current_minterms:
-            if (minterm >> (remaining_vars - 1)) & 1 == 0:
-                # Remove the MSB and add to 0 set
-                new_minterm = minterm & ((1 << (remaining_vars - 1)) - 1)
-                minterms_0.add(new_minterm)
-            else:
-                # Remove the MSB and add to 1 set
-                new_minterm = minterm & ((1 << (remaining_vars - 1)) - 1)
-                minterms_1.add(new_minterm)
+        # Single variable - direct implementation
+        var_name = self.variables[self.num_variables - remaining_vars]
         
-        # Recursively expand
-        child_0 = self._recursive_shannon_expansion(minterms_0, remaining_vars - 1, depth + 1)
-        child_1 = self._recursive_shannon_expansion(minterms_1, remaining_vars - 1, depth + 1)
+        # Check minterms for this variable
+        has_0 = sub_tt & 1
+        has_1 = sub_tt & 2
         
-        return {
-            'type': 'mux',
-            'select': expand_var,
-            'input_0': child_0,
-            'input_1': child_1,
-            'depth': depth
-        }
+        if has_0 and has_1:
+            return _MuxNode(_MuxNode.CONSTANT, depth, value=1)
+        elif has_1:
+            return _MuxNode(_MuxNode.VARIABLE, depth, variable=var_name)
+        elif has_0:
+            return _MuxNode(_MuxNode.VARIABLE, depth, variable=var_name + "'")
+        else:
+            return _MuxNode(_MuxNode.CONSTANT, depth, value=0)
     
     def _design_balanced_mux_tree(self) -> Dict:
         """Design balanced multiplexer tree"""
@@ -369,7 +564,7 @@ class MultiplexerDesign:
             if isinstance(value, str) and value not in ['0', '1']:
                 # Estimate gates needed for this expression
                 gate_count += value.count('+') + value.count("'") 
-                literal_count += len([c for c in value if c.isalpha()])
+                literal_count += sum(map(str.isalpha, value))
         
         return {
             'mux_inputs': len(data_inputs),
@@ -378,46 +573,48 @@ class MultiplexerDesign:
             'complexity': 'low' if gate_count < 5 else 'medium' if gate_count < 15 else 'high'
         }
     
-    def _calculate_tree_cost(self, tree: Dict) -> Dict:
-        """Calculate cost for multiplexer tree"""
-        return self._recursive_cost_calculation(tree)
-    
-    def _recursive_cost_calculation(self, node: Dict) -> Dict:
-        """Recursively calculate tree implementation cost"""
-        if node['type'] == 'constant':
-            return {'muxes': 0, 'constants': 1, 'variables': 0}
-        elif node['type'] == 'variable':
-            return {'muxes': 0, 'constants': 0, 'variables': 1}
-        elif node['type'] == 'mux':
-            cost_0 = self._recursive_cost_calculation(node['input_0'])
-            cost_1 = self._recursive_cost_calculation(node['input_1'])
+    def _calculate_tree_metrics(self, tree: _MuxNode) -> Tuple[int, int, int, int]:
+        """
+        Calculate all tree metrics in a single post-order pass
+        
+        Metrics are memoized by node id, so subtrees shared through the
+        cofactor cache are measured once but still counted at every place
+        they occur in the tree.
+        
+        Args:
+            tree: Root node of the tree
+        
+        Returns:
+            Tuple of (muxes, constants, variables, depth)
+        """
+        memo = {}
+        stack = [(tree, False)]
+        
+        while stack:
+            node, children_ready = stack.pop()
+            key = id(node)
+            if key in memo:
+                continue
             
-            return {
-                'muxes': 1 + cost_0['muxes'] + cost_1['muxes'],
-                'constants': cost_0['constants'] + cost_1['constants'],
-                'variables': cost_0['variables'] + cost_1['variables']
-            }
+            if node.kind == _MuxNode.CONSTANT:
+                memo[key] = (0, 1, 0, 0)
+            elif node.kind == _MuxNode.VARIABLE:
+                memo[key] = (0, 0, 1, 0)
+            elif children_ready:
+                muxes_0, constants_0, variables_0, depth_0 = memo[id(node.input_0)]
+                muxes_1, constants_1, variables_1, depth_1 = memo[id(node.input_1)]
+                memo[key] = (
+                    1 + muxes_0 + muxes_1,
+                    constants_0 + constants_1,
+                    variables_0 + variables_1,
+                    1 + max(depth_0, depth_1)
+                )
+            else:
+                stack.append((node, True))
+                stack.append((node.input_1, False))
+                stack.append((node.input_0, False))
         
-        return {'muxes': 0, 'constants': 0, 'variables': 0}
-    
-    def _calculate_tree_depth(self, tree: Dict) -> int:
-        """Calculate depth of multiplexer tree"""
-        if tree['type'] in ['constant', 'variable']:
-            return 0
-        elif tree['type'] == 'mux':
-            return 1 + max(
-                self._calculate_tree_depth(tree['input_0']),
-                self._calculate_tree_depth(tree['input_1'])
-            )
-        return 0
-    
-    def _count_muxes_in_tree(self, tree: Dict) -> int:
-        """Count total multiplexers in tree"""
-        if tree['type'] in ['constant', 'variable']:
-            return 0
-        elif tree['type'] == 'mux':
-            return 1 + self._count_muxes_in_tree(tree['input_0']) + self._count_muxes_in_tree(tree['input_1'])
-        return 0
+        return memo[id(tree)]
     
     def display_mux_implementation(self, implementation: Dict) -> str:
         """
@@ -438,62 +635,93 @@ class MultiplexerDesign:
     
     def _display_single_mux(self, impl: Dict) -> str:
         """Display single multiplexer implementation"""
-        result = f"\nSingle {impl['mux_size']} Multiplexer Implementation\n"
-        result += "=" * 50 + "\n"
-        
-        result += f"Select Variables: {', '.join(impl['select_variables'])}\n\n"
-        
-        result += "Data Inputs:\n"
-        result += "-" * 20 + "\n"
+        select_variables = impl['select_variables']
+        binary_format = f"0{len(select_variables)}b"
+        parts = [
+            f"\nSingle {impl['mux_size']} Multiplexer Implementation\n",
+            "=" * 50 + "\n",
+            f"Select Variables: {', '.join(select_variables)}\n\n",
+            "Data Inputs:\n",
+            "-" * 20 + "\n",
+        ]
         
         for combo, expr in impl['data_input_expressions'].items():
-            select_binary = format(combo, f"0{len(impl['select_variables'])}b")
-            select_str = ''.join([f"{var}={bit}" for var, bit in zip(impl['select_variables'], select_binary)])
-            result += f"D{combo} ({select_str}): {expr}\n"
+            select_binary = format(combo, binary_format)
+            select_str = ''.join([f"{var}={bit}" for var, bit in zip(select_variables, select_binary)])
+            parts.append(f"D{combo} ({select_str}): {expr}\n")
         
         cost = impl['implementation_cost']
-        result += f"\nImplementation Cost:\n"
-        result += f"  MUX size: {impl['mux_size']}\n"
-        result += f"  Additional gates: {cost['additional_gates']}\n"
-        result += f"  Total literals: {cost['total_literals']}\n"
-        result += f"  Complexity: {cost['complexity']}\n"
+        parts.extend([
+            "\nImplementation Cost:\n",
+            f"  MUX size: {impl['mux_size']}\n",
+            f"  Additional gates: {cost['additional_gates']}\n",
+            f"  Total literals: {cost['total_literals']}\n",
+            f"  Complexity: {cost['complexity']}\n",
+        ])
         
-        return result
+        return "".join(parts)
     
     def _display_mux_tree(self, impl: Dict) -> str:
         """Display multiplexer tree implementation"""
-        result = f"\n{impl['type'].replace('_', ' ').title()}\n"
-        result += "=" * 40 + "\n"
+        parts = [
+            f"\n{impl['type'].replace('_', ' ').title()}\n",
+            "=" * 40 + "\n",
+        ]
         
         if 'tree_structure' in impl:
-            result += "Tree Structure:\n"
-            result += self._format_tree_structure(impl['tree_structure'], 0)
+            parts.append("Tree Structure:\n")
+            parts.append(self._format_tree_structure(impl['tree_structure'], 0))
         
         cost = impl.get('implementation_cost', {})
-        result += f"\nImplementation Metrics:\n"
-        result += f"  Total MUXes: {impl.get('mux_count', 'N/A')}\n"
-        result += f"  Tree depth: {impl.get('depth', 'N/A')}\n"
-        result += f"  Cost breakdown: {cost}\n"
+        parts.extend([
+            "\nImplementation Metrics:\n",
+            f"  Total MUXes: {impl.get('mux_count', 'N/A')}\n",
+            f"  Tree depth: {impl.get('depth', 'N/A')}\n",
+            f"  Cost breakdown: {cost}\n",
+        ])
         
-        return result
+        return "".join(parts)
     
-    def _format_tree_structure(self, node: Dict, indent: int) -> str:
-        """Format tree structure for display"""
-        spaces = "  " * indent
-        
-        if node['type'] == 'constant':
-            return f"{spaces}Constant: {node['value']}\n"
-        elif node['type'] == 'variable':
-            return f"{spaces}Variable: {node['variable']}\n"
-        elif node['type'] == 'mux':
-            result = f"{spaces}MUX (select: {node['select']})\n"
-            result += f"{spaces}├─0: "
-            result += self._format_tree_structure(node['input_0'], indent + 1).strip() + "\n"
-            result += f"{spaces}└─1: "
-            result += self._format_tree_structure(node['input_1'], indent + 1).strip() + "\n"
-            return result
-        
-        return f"{spaces}Unknown node type\n"
+    def _format_tree_structure(self, node: _MuxNode, indent: int) -> str:
+        """
+        Format tree structure for display
+        
+        Walks the tree in pre-order with an explicit stack. A child is
+        written inline after its "├─0: " / "└─1: " branch marker, so its
+        first line carries no indentation.
+        
+        Args:
+            node: Root node of the (sub)tree to format
+            indent: Indentation level of the root
+        
+        Returns:
+            Formatted tree as a string
+        """
+        parts = []
+        stack = [(node, indent, False)]
+        
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            
+            node, indent, inline = item
+            spaces = "  " * indent
+            lead = "" if inline else spaces
+            
+            if node.kind == _MuxNode.CONSTANT:
+                parts.append(f"{lead}Constant: {node.value}\n")
+            elif node.kind == _MuxNode.VARIABLE:
+                parts.append(f"{lead}Variable: {node.variable}\n")
+            else:
+                parts.append(f"{lead}MUX (select: {node.select})\n")
+                stack.append((node.input_1, indent + 1, True))
+                stack.append(f"{spaces}└─1: ")
+                stack.append((node.input_0, indent + 1, True))
+                stack.append(f"{spaces}├─0: ")
+        
+        return "".join(parts)
 
 
 def test_multiplexer_design():
@@ -515,6 +743,13 @@ def test_multiplexer_design():
     shannon_tree = mux_design.design_mux_tree("shannon")
     print(mux_design.display_mux_implementation(shannon_tree))
     
+    # Tree nodes still read like the old nested dicts
+    root = shannon_tree['tree_structure']
+    assert 'select' in root and 'value' not in root
+    assert root.get('value') is None and root.get('select') == root['select']
+    assert dict(root) == {key: root[key] for key in ('type', 'select', 'input_0', 'input_1', 'depth')}
+    assert json.loads(json.dumps(root.to_dict()))['type'] == 'mux'
+    
     # Compare implementations
     comparison = mux_design.compare_implementations()
     print("\nImplementation Comparison:")
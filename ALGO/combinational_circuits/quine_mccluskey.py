@@ -4,24 +4,135 @@ Systematic minimization of Boolean functions using tabular method
 """
 
 from typing import List, Set, Dict, Tuple, Optional
+from collections import defaultdict
+import heapq
 import itertools
 
+# Largest number of partial products Petrick's method may hold before the
+# covering step falls back to the greedy heuristic
+_PETRICK_MAX_PRODUCTS = 512
+
+
+def _combine_terms(values: List[int], masks: List[int], full_mask: int) -> Tuple[List[int], List[int], List[bool]]:
+    """
+    Run one combining pass of the tabular method over (value, mask) terms
+    
+    Terms are bucketed by ones count and mask, and each bucket is indexed by
+    value. A partner for a term must share its mask and have exactly one more
+    1 bit outside the mask, so the partners are probed directly.
+    
+    Args:
+        values: Fixed-bit values of the current terms
+        masks: Don't care masks of the current terms
+        full_mask: Mask with one bit set per variable
+        
+    Returns:
+        Tuple of (new values, new masks, per-term combined flags)
+    """
+    combined = [False] * len(values)
+    seen = {}
+    
+    # Ones counts are computed once per pass and shared by every step below
+    ones = [value.bit_count() for value in values]
+    
+    buckets = defaultdict(dict)
+    for index, (value, mask, count) in enumerate(zip(values, masks, ones)):
+        buckets[count, mask][value] = index
+    
+    order = sorted(range(len(values)), key=ones.__getitem__)
+    for i in order:
+        value = values[i]
+        mask = masks[i]
+        lookup = buckets.get((ones[i] + 1, mask))
+        if not lookup:
+            continue
+        zeros = ~value & ~mask & full_mask
+        while zeros:
+            bit = zeros & -zeros
+            zeros ^= bit
+            j = lookup.get(value | bit)
+            if j is not None:
+                seen.setdefault((value, mask | bit), None)
+                combined[i] = combined[j] = True
+    
+    return [v for v, _ in seen], [m for _, m in seen], combined
+
+
+def _cube_minterm_mask(value: int, mask: int) -> int:
+    """
+    Build the minterm bitmask of a (value, mask) cube
+    
+    Args:
+        value: Fixed-bit value of the cube
+        mask: Don't care mask of the cube
+        
+    Returns:
+        Integer with bit m set for every minterm m inside the cube
+    """
+    minterm_mask = 1 << value
+    sub = mask
+    # Walk every non-empty submask of the don't care mask
+    while sub:
+        minterm_mask |= 1 << (value | sub)
+        sub = (sub - 1) & mask
+    return minterm_mask
+
+
+def _mask_to_list(minterm_mask: int) -> List[int]:
+    """
+    List the minterms set in a minterm bitmask, in ascending order
+    
+    Args:
+        minterm_mask: Integer with bit m set for each minterm m
+        
+    Returns:
+        Sorted list of minterm indices
+    """
+    minterms = []
+    while minterm_mask:
+        low_bit = minterm_mask & -minterm_mask
+        minterms.append(low_bit.bit_length() - 1)
+        minterm_mask ^= low_bit
+    return minterms
+
 
 class Term:
     """Represents a term in the Quine-McCluskey algorithm"""
     
-    def __init__(self, minterms: Set[int], binary_rep: str):
+    def __init__(self, minterm_mask: int, value: int, mask: int, num_variables: int):
         """
         Initialize term
         
         Args:
-            minterms: Set of minterm indices this term covers
-            binary_rep: Binary representation with '-' for don't cares
-        """
-        self.minterms = minterms
-        self.binary_rep = binary_rep
-        self.num_variables = len(binary_rep)
-        self.used = False
+            minterm_mask: Bitmask with bit m set for each minterm m this term covers
+            value: Bits of the fixed literals that are 1 (0 under mask)
+            mask: Bits of the don't care positions ('-')
+            num_variables: Number of variables; variable i is bit num_variables-1-i
+        """
+        self.minterm_mask = minterm_mask
+        self.value = value
+        self.mask = mask
+        self.num_variables = num_variables
+        # Number of fixed (non don't care) literals in the term
+        self.literal_count = num_variables - mask.bit_count()
+        # (variable names, expression) from the last to_expression call
+        self.expression_cache = None
+    
+    @property
+    def minterms(self) -> Set[int]:
+        """Set of minterm indices this term covers"""
+        return set(_mask_to_list(self.minterm_mask))
+    
+    @property
+    def binary_rep(self) -> str:
+        """Binary representation with '-' for don't cares"""
+        bits = []
+        for i in range(self.num_variables - 1, -1, -1):
+            if (self.mask >> i) & 1:
+                bits.append('-')
+            else:
+                bits.append('1' if (self.value >> i) & 1 else '0')
+        return ''.join(bits)
     
     def can_combine_with(self, other: 'Term') -> bool:
         """
@@ -33,19 +144,10 @@ class Term:
         Returns:
             True if terms can be combined (differ by exactly one literal)
         """
-        if len(self.binary_rep) != len(other.binary_rep):
+        if self.num_variables != other.num_variables or self.mask != other.mask:
             return False
         
-        differences = 0
-        for i, (bit1, bit2) in enumerate(zip(self.binary_rep, other.binary_rep)):
-            if bit1 != bit2:
-                if bit1 == '-' or bit2 == '-':
-                    return False
-                differences += 1
-                if differences > 1:
-                    return False
-        
-        return differences == 1
+        return (self.value ^ other.value).bit_count() == 1
     
     def combine_with(self, other: 'Term') -> 'Term':
         """
@@ -60,15 +162,8 @@ class Term:
         if not self.can_combine_with(other):
             raise ValueError("Terms cannot be combined")
         
-        new_binary = ""
-        for bit1, bit2 in zip(self.binary_rep, other.binary_rep):
-            if bit1 == bit2:
-                new_binary += bit1
-            else:
-                new_binary += '-'
-        
-        new_minterms = self.minterms | other.minterms
-        return Term(new_minterms, new_binary)
+        diff = self.value ^ other.value
+        return Term(self.minterm_mask | other.minterm_mask, self.value & ~diff, self.mask | diff, self.num_variables)
     
     def covers_minterm(self, minterm: int) -> bool:
         """
@@ -80,7 +175,7 @@ class Term:
         Returns:
             True if term covers the minterm
         """
-        return minterm in self.minterms
+        return bool((self.minterm_mask >> minterm) & 1)
     
     def to_expression(self, variables: List[str]) -> str:
         """
@@ -92,30 +187,40 @@ class Term:
         Returns:
             Boolean expression string
         """
-        if len(variables) != len(self.binary_rep):
+        # Variable names are part of the key since callers may rename them
+        names = tuple(variables)
+        if self.expression_cache is not None and self.expression_cache[0] == names:
+            return self.expression_cache[1]
+        
+        if len(variables) != self.num_variables:
             raise ValueError("Number of variables must match binary representation length")
         
         literals = []
-        for i, bit in enumerate(self.binary_rep):
-            if bit == '1':
-                literals.append(variables[i])
-            elif bit == '0':
-                literals.append(variables[i] + "'")
-            # Skip don't cares ('-')
+        for i, variable in enumerate(variables):
+            bit = 1 << (self.num_variables - 1 - i)
+            if self.mask & bit:
+                continue  # Skip don't cares ('-')
+            if self.value & bit:
+                literals.append(variable)
+            else:
+                literals.append(variable + "'")
         
-        return ''.join(literals) if literals else '1'
+        expression = ''.join(literals) if literals else '1'
+        self.expression_cache = (names, expression)
+        return expression
     
     def __str__(self) -> str:
-        return f"Term({sorted(self.minterms)}, {self.binary_rep})"
+        return f"Term({_mask_to_list(self.minterm_mask)}, {self.binary_rep})"
     
     def __repr__(self) -> str:
         return self.__str__()
     
     def __eq__(self, other) -> bool:
-        return isinstance(other, Term) and self.binary_rep == other.binary_rep
+        return (isinstance(other, Term) and self.value == other.value
+                and self.mask == other.mask and self.num_variables == other.num_variables)
     
-    def __hash__(self) -> bool:
-        return hash(self.binary_rep)
+    def __hash__(self) -> int:
+        return hash((self.value, self.mask, self.num_variables))
 
 
 class QuineMcCluskey:
@@ -137,7 +242,13 @@ class QuineMcCluskey:
         self.variables = [f'A{i}' for i in range(num_variables)]
         self.minterms = set()
         self.dont_cares = set()
+        # Bit m is set iff minterm m is in the function
+        self.minterm_mask = 0
         self.prime_implicants = []
+        # Prime implicants keyed by (minterms, don't cares, num_variables)
+        self.pi_cache = {}
+        # Coverage tables keyed by the id of the prime implicant list
+        self.coverage_cache = {}
         
     def set_function(self, minterms: List[int], dont_cares: List[int] = None) -> None:
         """
@@ -155,49 +266,12 @@ class QuineMcCluskey:
         for minterm in self.minterms | self.dont_cares:
             if minterm < 0 or minterm > max_value:
                 raise ValueError(f"Minterm {minterm} out of range [0, {max_value}]")
-    
-    def _decimal_to_binary(self, decimal: int) -> str:
-        """
-        Convert decimal to binary string with fixed width
-        
-        Args:
-            decimal: Decimal number to convert
-            
-        Returns:
-            Binary string representation
-        """
-        return format(decimal, f'0{self.num_variables}b')
-    
-    def _count_ones(self, binary_str: str) -> int:
-        """
-        Count number of ones in binary string
-        
-        Args:
-            binary_str: Binary string
-            
-        Returns:
-            Number of ones
-        """
-        return binary_str.count('1')
-    
-    def _group_by_ones(self, terms: List[Term]) -> Dict[int, List[Term]]:
-        """
-        Group terms by number of ones in their binary representation
-        
-        Args:
-            terms: List of terms to group
-            
-        Returns:
-            Dictionary mapping number of ones to list of terms
-        """
-        groups = {}
-        for term in terms:
-            ones_count = self._count_ones(term.binary_rep)
-            if ones_count not in groups:
-                groups[ones_count] = []
-            groups[ones_count].append(term)
         
-        return groups
+        self.minterm_mask = 0
+        for minterm in self.minterms:
+            self.minterm_mask |= 1 << minterm
+        self.pi_cache = {}
+        self.coverage_cache = {}
     
     def _find_prime_implicants(self) -> List[Term]:
         """
@@ -206,48 +280,34 @@ class QuineMcCluskey:
         Returns:
             List of prime implicant terms
         """
-        # Step 1: Create initial terms from minterms and don't cares
-        all_terms = self.minterms | self.dont_cares
-        current_terms = []
+        key = (frozenset(self.minterms), frozenset(self.dont_cares), self.num_variables)
+        cached = self.pi_cache.get(key)
+        if cached is not None:
+            return cached
         
-        for term in all_terms:
-            binary_rep = self._decimal_to_binary(term)
-            current_terms.append(Term({term}, binary_rep))
+        # Step 1: Create initial terms from minterms and don't cares
+        values = list(self.minterms | self.dont_cares)
+        masks = [0] * len(values)
         
         prime_implicants = []
+        full_mask = (1 << self.num_variables) - 1
         
-        # Step 2: Iteratively combine terms
-        while current_terms:
-            # Group terms by number of ones
-            groups = self._group_by_ones(current_terms)
-            next_terms = []
-            
-            # Try to combine terms between adjacent groups
-            for ones_count in sorted(groups.keys()):
-                if ones_count + 1 in groups:
-                    group1 = groups[ones_count]
-                    group2 = groups[ones_count + 1]
-                    
-                    # Try all combinations between the two groups
-                    for term1 in group1:
-                        for term2 in group2:
-                            if term1.can_combine_with(term2):
-                                combined_term = term1.combine_with(term2)
-                                if combined_term not in next_terms:
-                                    next_terms.append(combined_term)
-                                term1.used = True
-                                term2.used = True
+        # Step 2: Iteratively combine terms as plain integers
+        while values:
+            next_values, next_masks, combined = _combine_terms(values, masks, full_mask)
             
-            # Add unused terms to prime implicants
-            for term in current_terms:
-                if not term.used:
-                    prime_implicants.append(term)
+            # Terms that combined with nothing are prime implicants
+            for value, mask, was_combined in zip(values, masks, combined):
+                if not was_combined:
+                    prime_implicants.append(
+                        Term(_cube_minterm_mask(value, mask), value, mask, self.num_variables))
             
-            current_terms = next_terms
+            values, masks = next_values, next_masks
         
+        self.pi_cache[key] = prime_implicants
         return prime_implicants
     
-    def _create_coverage_table(self, prime_implicants: List[Term]) -> Dict[Term, Set[int]]:
+    def _create_coverage_table(self, prime_implicants: List[Term]) -> Dict[Term, int]:
         """
         Create coverage table showing which minterms each prime implicant covers
         
@@ -255,17 +315,23 @@ class QuineMcCluskey:
             prime_implicants: List of prime implicants
             
         Returns:
-            Dictionary mapping prime implicants to covered minterms
+            Dictionary mapping prime implicants to the bitmask of covered minterms
         """
+        # The list is stored with its table so a reused id is not mistaken for it
+        cached = self.coverage_cache.get(id(prime_implicants))
+        if cached is not None and cached[0] is prime_implicants:
+            return cached[1]
+        
         coverage = {}
         for pi in prime_implicants:
-            covered_minterms = pi.minterms & self.minterms
+            covered_minterms = pi.minterm_mask & self.minterm_mask
             if covered_minterms:  # Only include PIs that cover actual minterms
                 coverage[pi] = covered_minterms
         
+        self.coverage_cache[id(prime_implicants)] = (prime_implicants, coverage)
         return coverage
     
-    def _find_essential_prime_implicants(self, coverage: Dict[Term, Set[int]]) -> Tuple[List[Term], Set[int]]:
+    def _find_essential_prime_implicants(self, coverage: Dict[Term, int]) -> Tuple[List[Term], int]:
         """
         Find essential prime implicants
         
@@ -273,30 +339,31 @@ class QuineMcCluskey:
             coverage: Coverage table
             
         Returns:
-            Tuple of (essential prime implicants, covered minterms)
+            Tuple of (essential prime implicants, bitmask of covered minterms)
         """
         essential_pis = []
-        covered_minterms = set()
+        covered_minterms = 0
         
         # Find minterms covered by only one prime implicant
         for minterm in self.minterms:
-            covering_pis = [pi for pi, covered in coverage.items() if minterm in covered]
+            bit = 1 << minterm
+            covering_pis = [pi for pi, covered in coverage.items() if covered & bit]
             
             if len(covering_pis) == 1:
                 essential_pi = covering_pis[0]
                 if essential_pi not in essential_pis:
                     essential_pis.append(essential_pi)
-                    covered_minterms.update(coverage[essential_pi])
+                    covered_minterms |= coverage[essential_pi]
         
         return essential_pis, covered_minterms
     
-    def _solve_covering_problem(self, coverage: Dict[Term, Set[int]], uncovered_minterms: Set[int]) -> List[Term]:
+    def _solve_covering_problem(self, coverage: Dict[Term, int], uncovered_minterms: int) -> List[Term]:
         """
         Solve the covering problem to find minimum set of prime implicants
         
         Args:
             coverage: Coverage table
-            uncovered_minterms: Minterms not yet covered
+            uncovered_minterms: Bitmask of minterms not yet covered
             
         Returns:
             Minimum set of additional prime implicants
@@ -311,34 +378,184 @@ class QuineMcCluskey:
             if relevant_covered:
                 relevant_coverage[pi] = relevant_covered
         
-        # Use greedy approach for simplicity (can be improved with exact algorithms)
-        selected_pis = []
-        remaining_minterms = uncovered_minterms.copy()
+        forced_pis, relevant_coverage, uncovered_minterms = self._reduce_covering_problem(
+            relevant_coverage, uncovered_minterms)
+        if not uncovered_minterms:
+            return forced_pis
         
-        while remaining_minterms and relevant_coverage:
-            # Choose PI that covers most remaining minterms
-            best_pi = None
-            best_coverage_size = 0
+        pis = list(relevant_coverage)
+        selection = self._petrick_cover(pis, relevant_coverage, uncovered_minterms)
+        if selection is None:
+            selection = self._greedy_cover(relevant_coverage, uncovered_minterms)
+        
+        return forced_pis + selection
+    
+    def _reduce_covering_problem(self, coverage: Dict[Term, int],
+                                 uncovered_minterms: int) -> Tuple[List[Term], Dict[Term, int], int]:
+        """
+        Shrink the covering problem with dominance rules until nothing changes
+        
+        A PI is dropped when another PI covers all of its minterms with no
+        more literals (column dominance). A minterm is dropped when every PI
+        covering some other minterm also covers it (row dominance). A minterm
+        left with a single covering PI forces that PI into the cover.
+        
+        Args:
+            coverage: Coverage table restricted to the uncovered minterms
+            uncovered_minterms: Bitmask of minterms to cover
+            
+        Returns:
+            Tuple of (forced prime implicants, reduced coverage table,
+            bitmask of minterms still uncovered)
+        """
+        pis = list(coverage)
+        covers = [coverage[pi] for pi in pis]
+        forced_pis = []
+        
+        while uncovered_minterms:
+            # Column dominance: larger covers first, then cheaper PIs
+            literals = [pi.literal_count for pi in pis]
+            order = sorted(range(len(pis)), key=lambda i: (-covers[i].bit_count(), literals[i]))
+            kept = []
+            for i in order:
+                covered = covers[i]
+                if not any(covers[k] & covered == covered and literals[k] <= literals[i]
+                           for k in kept):
+                    kept.append(i)
+            columns_dropped = len(kept) < len(pis)
+            kept.sort()
+            pis = [pis[i] for i in kept]
+            covers = [covers[i] for i in kept]
             
-            for pi, covered in relevant_coverage.items():
-                coverage_size = len(covered & remaining_minterms)
-                if coverage_size > best_coverage_size:
-                    best_coverage_size = coverage_size
-                    best_pi = pi
+            # Rows as bitmasks over the remaining PIs
+            rows = {}
+            for index, covered in enumerate(covers):
+                for minterm in _mask_to_list(covered):
+                    rows[minterm] = rows.get(minterm, 0) | (1 << index)
             
-            if best_pi:
-                selected_pis.append(best_pi)
-                newly_covered = relevant_coverage[best_pi] & remaining_minterms
-                remaining_minterms -= newly_covered
-                
-                # Remove covered minterms from coverage table
-                for pi in list(relevant_coverage.keys()):
-                    relevant_coverage[pi] -= newly_covered
-                    if not relevant_coverage[pi]:
-                        del relevant_coverage[pi]
-            else:
+            # Row dominance: a minterm whose row contains another's is free
+            kept_rows = []
+            for minterm in sorted(rows, key=lambda m: (rows[m].bit_count(), m)):
+                row = rows[minterm]
+                if not any(rows[other] & row == rows[other] for other in kept_rows):
+                    kept_rows.append(minterm)
+            rows_dropped = len(kept_rows) < len(rows)
+            
+            # Dropped rows are covered along with the rows they contain, so
+            # only the kept rows not already covered by forced PIs remain
+            uncovered_minterms = 0
+            for minterm in kept_rows:
+                uncovered_minterms |= 1 << minterm
+            
+            # Minterms left with a single covering PI force that PI
+            forced = 0
+            for minterm in kept_rows:
+                row = rows[minterm]
+                if row.bit_count() == 1:
+                    forced |= row
+            for index in _mask_to_list(forced):
+                forced_pis.append(pis[index])
+                uncovered_minterms &= ~covers[index]
+            
+            remaining = [index for index, covered in enumerate(covers)
+                         if covered & uncovered_minterms and not (forced >> index) & 1]
+            pis = [pis[index] for index in remaining]
+            covers = [covers[index] & uncovered_minterms for index in remaining]
+            
+            if not (columns_dropped or rows_dropped or forced):
                 break
         
+        table = dict(zip(pis, covers))
+        return forced_pis, table, uncovered_minterms
+    
+    def _petrick_cover(self, pis: List[Term], coverage: Dict[Term, int],
+                       uncovered_minterms: int) -> Optional[List[Term]]:
+        """
+        Find an exact minimum cover with Petrick's method
+        
+        Each uncovered minterm gives a clause: the bitmask of the PIs (by
+        position in pis) that cover it. Multiplying the clauses out gives
+        every irredundant cover as a product bitmask, and absorbed products
+        are dropped after each step.
+        
+        Args:
+            pis: Candidate prime implicants
+            coverage: Coverage table restricted to the uncovered minterms
+            uncovered_minterms: Bitmask of minterms to cover
+            
+        Returns:
+            Prime implicants of the cheapest cover, or None if an expansion
+            step grows past _PETRICK_MAX_PRODUCTS
+        """
+        clauses = set()
+        for minterm in _mask_to_list(uncovered_minterms):
+            bit = 1 << minterm
+            clause = 0
+            for index, pi in enumerate(pis):
+                if coverage[pi] & bit:
+                    clause |= 1 << index
+            clauses.add(clause)
+        
+        products = [0]
+        for clause in sorted(clauses, key=int.bit_count):
+            choices = [1 << index for index in range(clause.bit_length()) if (clause >> index) & 1]
+            expanded = {product if product & clause else product | choice
+                        for product in products for choice in choices}
+            if len(expanded) > _PETRICK_MAX_PRODUCTS:
+                return None
+            
+            # Absorption: drop any product that contains a smaller one
+            products = []
+            for product in sorted(expanded, key=int.bit_count):
+                if not any(kept & product == kept for kept in products):
+                    products.append(product)
+        
+        def cost(product: int) -> Tuple[int, int, int]:
+            literals = sum(pi.literal_count for index, pi in enumerate(pis) if (product >> index) & 1)
+            return product.bit_count(), literals, product
+        
+        best = min(products, key=cost)
+        return [pi for index, pi in enumerate(pis) if (best >> index) & 1]
+    
+    def _greedy_cover(self, coverage: Dict[Term, int], uncovered_minterms: int) -> List[Term]:
+        """
+        Cover the minterms greedily, always taking the PI that covers the most
+        
+        Ties go to the PI with fewer literals.
+        
+        Args:
+            coverage: Coverage table restricted to the uncovered minterms
+            uncovered_minterms: Bitmask of minterms to cover
+            
+        Returns:
+            Selected prime implicants
+        """
+        # Heap keys are upper bounds on coverage (coverage only shrinks), so
+        # a popped entry whose recomputed coverage still matches is the best
+        # choice; ties go to fewer literals, then the earliest PI
+        pis = list(coverage)
+        selected_pis = []
+        remaining_minterms = uncovered_minterms
+        heap = [(-(coverage[pi] & remaining_minterms).bit_count(), pi.literal_count, index)
+                for index, pi in enumerate(pis)]
+        heapq.heapify(heap)
+        
+        while remaining_minterms and heap:
+            key, literal_count, index = heapq.heappop(heap)
+            covered = coverage[pis[index]]
+            coverage_size = (covered & remaining_minterms).bit_count()
+            
+            if coverage_size == 0:
+                # Nothing left to cover - drop the entry for good
+                continue
+            if coverage_size != -key:
+                # Stale entry - reinsert with its current coverage
+                heapq.heappush(heap, (-coverage_size, literal_count, index))
+                continue
+            
+            selected_pis.append(pis[index])
+            remaining_minterms &= ~covered
+        
         return selected_pis
     
     def minimize(self) -> Dict[str, any]:
@@ -355,6 +572,7 @@ class QuineMcCluskey:
                 'essential_prime_implicants': [],
                 'selected_prime_implicants': [],
                 'cost': 0,
+                'literal_count': 0,
                 'coverage_table': {}
             }
         
@@ -368,47 +586,60 @@ class QuineMcCluskey:
         essential_pis, covered_by_essential = self._find_essential_prime_implicants(coverage)
         
         # Step 4: Solve covering problem for remaining minterms
-        uncovered_minterms = self.minterms - covered_by_essential
+        uncovered_minterms = self.minterm_mask & ~covered_by_essential
         additional_pis = self._solve_covering_problem(coverage, uncovered_minterms)
         
         # Step 5: Combine results
         selected_pis = essential_pis + additional_pis
         
-        # Generate simplified expression
-        expression_terms = []
-        for pi in selected_pis:
-            term_expr = pi.to_expression(self.variables)
-            if term_expr != '1':
-                expression_terms.append(term_expr)
-            else:
-                return {
-                    'simplified_expression': '1',
-                    'prime_implicants': [pi.to_expression(self.variables) for pi in prime_implicants],
-                    'essential_prime_implicants': [pi.to_expression(self.variables) for pi in essential_pis],
-                    'selected_prime_implicants': [pi.to_expression(self.variables) for pi in selected_pis],
-                    'cost': 1,
-                    'coverage_table': {pi.to_expression(self.variables): list(covered) for pi, covered in coverage.items()}
-                }
+        # Stringify each prime implicant once; selected PIs are a subset
+        expressions = {pi: pi.to_expression(self.variables) for pi in prime_implicants}
+        selected_expressions = [expressions[pi] for pi in selected_pis]
         
-        simplified_expression = ' + '.join(expression_terms) if expression_terms else '0'
+        # Generate simplified expression
+        if '1' in selected_expressions:
+            simplified_expression = '1'
+            cost = 1
+        else:
+            simplified_expression = ' + '.join(selected_expressions) if selected_expressions else '0'
+            cost = len(selected_pis)
         
         return {
             'simplified_expression': simplified_expression,
-            'prime_implicants': [pi.to_expression(self.variables) for pi in prime_implicants],
-            'essential_prime_implicants': [pi.to_expression(self.variables) for pi in essential_pis],
-            'selected_prime_implicants': [pi.to_expression(self.variables) for pi in selected_pis],
-            'cost': len(selected_pis),
-            'coverage_table': {pi.to_expression(self.variables): list(covered) for pi, covered in coverage.items()}
+            'prime_implicants': list(expressions.values()),
+            'essential_prime_implicants': [expressions[pi] for pi in essential_pis],
+            'selected_prime_implicants': selected_expressions,
+            'cost': cost,
+            'literal_count': sum(pi.literal_count for pi in selected_pis),
+            'coverage_table': {expressions[pi]: _mask_to_list(covered) for pi, covered in coverage.items()}
         }
     
-    def display_prime_implicant_table(self) -> str:
+    def analyze(self) -> Dict[str, any]:
+        """
+        Minimize the function and render both tables in one call
+        
+        Returns:
+            Dictionary with the minimize() results plus the formatted
+            'prime_implicant_table' and 'coverage_table_display' strings
+        """
+        prime_implicants = self._find_prime_implicants()
+        analysis = self.minimize()
+        analysis['prime_implicant_table'] = self.display_prime_implicant_table(prime_implicants)
+        analysis['coverage_table_display'] = self.display_coverage_table(prime_implicants)
+        return analysis
+    
+    def display_prime_implicant_table(self, prime_implicants: Optional[List[Term]] = None) -> str:
         """
         Display the prime implicant table
         
+        Args:
+            prime_implicants: Prime implicants to show (found if not given)
+            
         Returns:
             Formatted string representation of the table
         """
-        prime_implicants = self._find_prime_implicants()
+        if prime_implicants is None:
+            prime_implicants = self._find_prime_implicants()
         
         result = "\nPrime Implicant Table:\n"
         result += "=" * 50 + "\n"
@@ -417,27 +648,32 @@ class QuineMcCluskey:
         
         for pi in prime_implicants:
             expr = pi.to_expression(self.variables)
-            covered = list(pi.minterms & self.minterms)
+            covered = _mask_to_list(pi.minterm_mask & self.minterm_mask)
             result += f"{expr:<20} {pi.binary_rep:<15} {str(covered):<20}\n"
         
         return result
     
-    def display_coverage_table(self) -> str:
+    def display_coverage_table(self, prime_implicants: Optional[List[Term]] = None) -> str:
         """
         Display the coverage table
         
+        Args:
+            prime_implicants: Prime implicants to show (found if not given)
+            
         Returns:
             Formatted string representation of the coverage table
         """
-        prime_implicants = self._find_prime_implicants()
+        if prime_implicants is None:
+            prime_implicants = self._find_prime_implicants()
         coverage = self._create_coverage_table(prime_implicants)
+        minterms = sorted(self.minterms)
         
         result = "\nCoverage Table:\n"
         result += "=" * 60 + "\n"
         
         # Header
         result += f"{'Prime Implicant':<20}"
-        for minterm in sorted(self.minterms):
+        for minterm in minterms:
             result += f"{minterm:<4}"
         result += "\n"
         result += "-" * 60 + "\n"
@@ -446,8 +682,8 @@ class QuineMcCluskey:
         for pi, covered in coverage.items():
             expr = pi.to_expression(self.variables)
             result += f"{expr:<20}"
-            for minterm in sorted(self.minterms):
-                mark = "X" if minterm in covered else " "
+            for minterm in minterms:
+                mark = "X" if (covered >> minterm) & 1 else " "
                 result += f"{mark:<4}"
             result += "\n"
         
@@ -469,9 +705,11 @@ def test_quine_mccluskey():
     print(f"Prime Implicants: {result['prime_implicants']}")
     print(f"Essential Prime Implicants: {result['essential_prime_implicants']}")
     print(f"Cost: {result['cost']}")
+    print(f"Literal Count: {result['literal_count']}")
     
-    print(qm.display_prime_implicant_table())
-    print(qm.display_coverage_table())
+    analysis = qm.analyze()
+    print(analysis['prime_implicant_table'])
+    print(analysis['coverage_table_display'])
     
     # Test case 2: Function with don't cares
     print("\n" + "=" * 50)
@@ -5,9 +5,78 @@ Recursive Boolean function decomposition using Shannon's expansion theorem
 
 from typing import Dict, List, Set, Tuple, Union, Optional, Callable
 import itertools
+import re
 from functools import lru_cache
 
 
+# Constant-folding rules for generated expressions, applied in one pass. A
+# constant only matches as a whole token, never as the end of a name like A0
+_SIMPLIFY_RE = re.compile(
+    r"·\(1\)|\(1\)·"
+    r"| \+ 0(?![\w'(])|(?<![\w')])0 \+ "
+    r"|·0(?![\w'(])|(?<![\w')])0·"
+    r"| {2,}"
+)
+_SIMPLIFY_REPLACEMENTS = {
+    '·(1)': '',
+    '(1)·': '',
+    ' + 0': '',
+    '0 + ': '',
+    '·0': '0',
+    '0·': '0',
+}
+
+
+def _repeat_bits(width: int, period: int, total: int) -> int:
+    """
+    Build a mask with the low `width` bits of every `period`-bit block set
+    
+    Args:
+        width: Number of set bits at the bottom of each block
+        period: Block length in bits
+        total: Total mask length in bits (a multiple of period)
+        
+    Returns:
+        The repeated bit pattern as an integer
+    """
+    return ((1 << width) - 1) * (((1 << total) - 1) // ((1 << period) - 1))
+
+
+@lru_cache(maxsize=64)
+def _cofactor_masks(num_variables: int, variable_index: int) -> Tuple[int, int, Tuple[Tuple[int, int], ...]]:
+    """
+    Precompute the masks that extract cofactors from packed truth tables
+    
+    Entries whose index has the variable's bit clear sit in blocks of
+    `stride` bits, every 2*stride bits. After selecting those blocks, each
+    merge step moves every other chunk down by the chunk width, doubling
+    the chunk size until one contiguous table remains. The masks repeat
+    over four tables laid end to end, so both cofactors of both the
+    truth table and the care mask are packed in the same pass.
+    
+    Args:
+        num_variables: Number of variables of the function
+        variable_index: Variable to fix (0 is the most significant)
+        
+    Returns:
+        Tuple of (stride, block select mask, merge steps as (width, mask))
+    """
+    total = 1 << num_variables
+    stride = 1 << (num_variables - 1 - variable_index)
+    steps = []
+    chunk = stride
+    while 2 * chunk < total:
+        steps.append((chunk, _repeat_bits(chunk, 4 * chunk, 4 * total)))
+        chunk *= 2
+    return stride, _repeat_bits(stride, 2 * stride, 4 * total), tuple(steps)
+
+
+@lru_cache(maxsize=64)
+def _var_bit_shifts(num_variables: int) -> Tuple[int, ...]:
+    """Bit position of each variable in a minterm index (variable 0 is the MSB)"""
+    return tuple(range(num_variables - 1, -1, -1))
+
+
 class BooleanFunction:
     """Represents a Boolean function for Shannon expansion"""
     
@@ -16,6 +85,10 @@ class BooleanFunction:
         """
         Initialize Boolean function
         
+        The truth table is stored as two integer bitmasks: bit i of tt_mask
+        is set iff f(i) = 1, and bit i of care_mask is set iff f(i) is
+        defined (a dict input may leave entries out).
+        
         Args:
             truth_table: Truth table as list or dict mapping minterm->value
             expression: Boolean expression string (optional)
@@ -24,20 +97,77 @@ class BooleanFunction:
         self.num_variables = num_variables
         self.variables = [f'A{i}' for i in range(num_variables)] if num_variables else []
         self.expression = expression
+        self.tt_mask = 0
+        self.care_mask = 0
         
         if isinstance(truth_table, list):
-            self.truth_table = {i: val for i, val in enumerate(truth_table)}
+            for i, val in enumerate(truth_table):
+                if val == 1:
+                    self.tt_mask |= 1 << i
+            self.care_mask = (1 << len(truth_table)) - 1
             if not num_variables:
                 self.num_variables = len(truth_table).bit_length() - 1
                 self.variables = [f'A{i}' for i in range(self.num_variables)]
         elif isinstance(truth_table, dict):
-            self.truth_table = truth_table
+            for i, val in truth_table.items():
+                self.care_mask |= 1 << i
+                if val == 1:
+                    self.tt_mask |= 1 << i
             if not num_variables:
                 max_minterm = max(truth_table.keys()) if truth_table else 0
                 self.num_variables = (max_minterm + 1).bit_length() - 1
                 self.variables = [f'A{i}' for i in range(self.num_variables)]
-        else:
-            self.truth_table = {}
+    
+    @classmethod
+    def _from_masks(cls, tt_mask: int, care_mask: int, num_variables: int,
+                    variables: List[str]) -> 'BooleanFunction':
+        """
+        Build a function directly from its bitmasks
+        
+        Args:
+            tt_mask: Bit i set iff f(i) = 1
+            care_mask: Bit i set iff f(i) is defined
+            num_variables: Number of input variables
+            variables: Variable names
+            
+        Returns:
+            New Boolean function
+        """
+        func = cls(num_variables=num_variables)
+        func.tt_mask = tt_mask
+        func.care_mask = care_mask
+        func.variables = variables
+        return func
+    
+    @classmethod
+    def from_minterms(cls, minterms: List[int], num_variables: int,
+                      dont_cares: List[int] = None) -> 'BooleanFunction':
+        """
+        Build a function from its minterm list without a truth table list
+        
+        Args:
+            minterms: Minterms where function = 1
+            num_variables: Number of input variables
+            dont_cares: Minterms left undefined (optional)
+        
+        Returns:
+            New Boolean function
+        """
+        tt_mask = 0
+        for m in minterms:
+            tt_mask |= 1 << m
+        care_mask = (1 << (1 << num_variables)) - 1
+        for m in dont_cares or []:
+            care_mask &= ~(1 << m)
+        return cls._from_masks(tt_mask, care_mask, num_variables,
+                               [f'A{i}' for i in range(num_variables)])
+    
+    @property
+    def truth_table(self) -> Dict[int, int]:
+        """Truth table as a {minterm: value} dict of the defined entries"""
+        tt_mask = self.tt_mask
+        care_mask = self.care_mask
+        return {i: (tt_mask >> i) & 1 for i in range(care_mask.bit_length()) if (care_mask >> i) & 1}
     
     def evaluate(self, inputs: Union[List[int], Dict[str, int], int]) -> int:
         """
@@ -50,34 +180,154 @@ class BooleanFunction:
             Function output (0 or 1)
         """
         if isinstance(inputs, int):
-            return self.truth_table.get(inputs, 0)
+            minterm = inputs
         elif isinstance(inputs, list):
-            minterm = sum(bit * (2 ** i) for i, bit in enumerate(reversed(inputs)))
-            return self.truth_table.get(minterm, 0)
+            minterm = 0
+            for bit in inputs:
+                minterm = (minterm << 1) + bit
         elif isinstance(inputs, dict):
             minterm = 0
-            for i, var in enumerate(self.variables):
-                if var in inputs and inputs[var]:
-                    minterm += 2 ** (self.num_variables - 1 - i)
-            return self.truth_table.get(minterm, 0)
+            for var, shift in zip(self.variables, _var_bit_shifts(self.num_variables)):
+                if inputs.get(var):
+                    minterm |= 1 << shift
         else:
             return 0
+        return (self.tt_mask >> minterm) & 1 if minterm >= 0 else 0
+    
+    def evaluate_batch(self, input_rows: List[List[int]]) -> List[int]:
+        """
+        Evaluate function for many input vectors at once
+        
+        Args:
+            input_rows: Input vectors, each a list of bits with variable 0 first
+        
+        Returns:
+            List of function outputs (0 or 1), one per input vector
+        """
+        tt_mask = self.tt_mask
+        outputs = []
+        append = outputs.append
+        for row in input_rows:
+            minterm = 0
+            for bit in row:
+                minterm = (minterm << 1) + bit
+            append((tt_mask >> minterm) & 1 if minterm >= 0 else 0)
+        return outputs
     
     def get_minterms(self) -> Set[int]:
         """Get set of minterms where function = 1"""
-        return {minterm for minterm, value in self.truth_table.items() if value == 1}
+        mask = self.tt_mask
+        return {i for i in range(mask.bit_length()) if (mask >> i) & 1}
     
     def get_maxterms(self) -> Set[int]:
         """Get set of maxterms where function = 0"""
-        return {minterm for minterm, value in self.truth_table.items() if value == 0}
+        mask = self.care_mask & ~self.tt_mask
+        return {i for i in range(mask.bit_length()) if (mask >> i) & 1}
     
     def copy(self) -> 'BooleanFunction':
         """Create a copy of this function"""
-        return BooleanFunction(
-            truth_table=self.truth_table.copy(),
-            expression=self.expression,
-            num_variables=self.num_variables
-        )
+        func = BooleanFunction._from_masks(self.tt_mask, self.care_mask,
+                                           self.num_variables, self.variables.copy())
+        func.expression = self.expression
+        return func
+
+
+class _ExpansionNode:
+    """
+    Node of a Shannon expansion tree.
+    
+    Nodes use __slots__ instead of per-node dicts. The variable list is
+    shared with the node's function and minterms are only computed when
+    asked for. Item access with the old dict keys ('function', 'depth',
+    'variables', 'minterms', 'is_leaf', 'children', 'constant_value',
+    'expansion_variable') keeps existing readers working.
+    """
+    
+    __slots__ = ('function', 'depth', 'is_leaf', 'children', 'constant_value',
+                 'expansion_variable', '_minterms')
+    
+    _KEYS = ('function', 'depth', 'variables', 'minterms', 'is_leaf', 'children')
+    
+    def __init__(self, function: BooleanFunction, depth: int):
+        self.function = function
+        self.depth = depth
+        self.is_leaf = False
+        self.children = {}
+        self.constant_value = None
+        self.expansion_variable = None
+        self._minterms = None
+    
+    @property
+    def variables(self) -> List[str]:
+        """Variables of the node's function"""
+        return self.function.variables
+    
+    @property
+    def minterms(self) -> Set[int]:
+        """Minterms of the node's function, computed on first use"""
+        if self._minterms is None:
+            self._minterms = self.function.get_minterms()
+        return self._minterms
+    
+    def __contains__(self, key: str) -> bool:
+        if key == 'constant_value':
+            return self.is_leaf
+        if key == 'expansion_variable':
+            return not self.is_leaf
+        return key in self._KEYS
+    
+    def __getitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
+        """Dict-style get with the old node keys"""
+        return getattr(self, key) if key in self else default
+    
+    def __repr__(self) -> str:
+        if self.is_leaf:
+            return f"_ExpansionNode(depth={self.depth}, constant_value={self.constant_value})"
+        return f"_ExpansionNode(depth={self.depth}, expansion_variable={self.expansion_variable!r})"
+
+
+def _cofactors(func: BooleanFunction, variable_index: int) -> Tuple[BooleanFunction, BooleanFunction]:
+    """
+    Create both cofactors of a variable in one pass over the truth table
+    
+    Args:
+        func: Function to split
+        variable_index: Index of variable to fix
+        
+    Returns:
+        Tuple of (positive cofactor, negative cofactor)
+    """
+    stride, select, steps = _cofactor_masks(func.num_variables, variable_index)
+    total = 1 << func.num_variables
+    table_mask = (1 << total) - 1
+    tt_mask = func.tt_mask & table_mask
+    care_mask = func.care_mask & table_mask
+    
+    # Lay out [tt, tt >> stride, care, care >> stride] so one select and
+    # one set of merge steps packs all four cofactor tables
+    tables = (tt_mask
+              | (tt_mask >> stride) << total
+              | care_mask << (2 * total)
+              | (care_mask >> stride) << (3 * total)) & select
+    for width, keep in steps:
+        tables = (tables & keep) | ((tables >> width) & (keep << width))
+    
+    half_mask = (1 << (total >> 1)) - 1
+    negative_tt = tables & half_mask
+    positive_tt = (tables >> total) & half_mask
+    negative_care = (tables >> (2 * total)) & half_mask
+    positive_care = (tables >> (3 * total)) & half_mask
+    
+    # Create new functions with one less variable
+    variables = [var for i, var in enumerate(func.variables) if i != variable_index]
+    num_variables = func.num_variables - 1
+    return (BooleanFunction._from_masks(positive_tt, positive_care, num_variables, variables),
+            BooleanFunction._from_masks(negative_tt, negative_care, num_variables, variables.copy()))
 
 
 class ShannonExpansion:
@@ -103,6 +353,8 @@ class ShannonExpansion:
         """
         self.function = function
         self.expansion_tree = None
+        # Expansion nodes keyed by (tt_mask, care_mask, depth), so identical
+        # subfunctions reached along different paths share one subtree
         self.decomposition_cache = {}
     
     def expand_on_variable(self, variable_index: int) -> Tuple[BooleanFunction, BooleanFunction]:
@@ -118,66 +370,9 @@ class ShannonExpansion:
         if variable_index >= self.function.num_variables:
             raise ValueError(f"Variable index {variable_index} out of range")
         
-        # Create positive cofactor (variable = 1)
-        positive_cofactor = self._create_cofactor(variable_index, 1)
-        
-        # Create negative cofactor (variable = 0)
-        negative_cofactor = self._create_cofactor(variable_index, 0)
-        
-        return positive_cofactor, negative_cofactor
-    
-    def _create_cofactor(self, variable_index: int, value: int) -> BooleanFunction:
-        """
-        Create cofactor by setting a variable to a specific value
-        
-        Args:
-            variable_index: Index of variable to fix
-            value: Value to set variable to (0 or 1)
-            
-        Returns:
-            Cofactor function
-        """
-        cofactor_truth_table = {}
-        
-        # Iterate through all minterms
-        for minterm, output in self.function.truth_table.items():
-            # Check if this minterm has the variable set to the desired value
-            variable_bit = (minterm >> (self.function.num_variables - 1 - variable_index)) & 1
-            
-            if variable_bit == value:
-                # Remove the fixed variable bit from minterm
-                new_minterm = self._remove_bit(minterm, variable_index, self.function.num_variables)
-                cofactor_truth_table[new_minterm] = output
-        
-        # Create new function with one less variable
-        cofactor = BooleanFunction(
-            truth_table=cofactor_truth_table,
-            num_variables=self.function.num_variables - 1
-        )
-        
-        # Update variable names
-        cofactor.variables = [var for i, var in enumerate(self.function.variables) if i != variable_index]
-        
-        return cofactor
+        return _cofactors(self.function, variable_index)
     
-    def _remove_bit(self, number: int, bit_position: int, total_bits: int) -> int:
-        """
-        Remove a bit from a number at a specific position
-        
-        Args:
-            number: Original number
-            bit_position: Position of bit to remove (0-indexed from left)
-            total_bits: Total number of bits
-            
-        Returns:
-            Number with bit removed
-        """
-        # Convert to binary, remove bit, convert back
-        binary = format(number, f'0{total_bits}b')
-        new_binary = binary[:bit_position] + binary[bit_position + 1:]
-        return int(new_binary, 2) if new_binary else 0
-    
-    def recursive_expansion(self, max_depth: int = None) -> Dict:
+    def recursive_expansion(self, max_depth: int = None) -> _ExpansionNode:
         """
         Perform recursive Shannon expansion to build expansion tree
         
@@ -185,98 +380,79 @@ class ShannonExpansion:
             max_depth: Maximum depth of expansion (None for complete expansion)
             
         Returns:
-            Dictionary representing the expansion tree
+            Root node of the expansion tree
         """
         if max_depth is None:
             max_depth = self.function.num_variables
         
-        self.expansion_tree = self._recursive_expand(self.function, 0, max_depth, [])
+        self.decomposition_cache = {}
+        self.expansion_tree = self._recursive_expand(self.function, 0, max_depth)
         return self.expansion_tree
     
-    def _recursive_expand(self, func: BooleanFunction, depth: int, max_depth: int, 
-                         expansion_path: List[Tuple[int, int]]) -> Dict:
+    def _recursive_expand(self, func: BooleanFunction, depth: int, max_depth: int) -> _ExpansionNode:
         """
-        Recursive helper for Shannon expansion
+        Build the Shannon expansion tree below a function
+        
+        The tree is built depth-first from an explicit stack, so deep
+        expansions are not limited by Python's recursion limit. Nodes do not
+        record the path that reached them, so a subfunction seen again at the
+        same depth reuses the node built the first time.
         
         Args:
-            func: Current function to expand
-            depth: Current depth in expansion tree
+            func: Function at the root of the expansion
+            depth: Depth of the root in the expansion tree
             max_depth: Maximum expansion depth
-            expansion_path: Path of variable assignments leading to this node
             
         Returns:
-            Node dictionary for expansion tree
-        """
-        node = {
-            'function': func,
-            'depth': depth,
-            'path': expansion_path.copy(),
-            'variables': func.variables.copy(),
-            'minterms': func.get_minterms(),
-            'is_leaf': False,
-            'children': {}
-        }
-        
-        # Check termination conditions
-        if (depth >= max_depth or 
-            func.num_variables == 0 or 
-            self._is_constant_function(func)):
-            node['is_leaf'] = True
-            node['constant_value'] = self._get_constant_value(func)
-            return node
+            Root node of the expansion below func
+        """
+        root = {}
+        # Each entry is (function, depth, parent children dict, child label)
+        stack = [(func, depth, root, 'root')]
         
-        # Choose variable to expand on (use first variable for simplicity)
-        if func.num_variables > 0:
-            expand_var_index = 0
-            expand_var_name = func.variables[expand_var_index]
+        while stack:
+            func, depth, parent_children, label = stack.pop()
             
-            # Perform Shannon expansion
-            positive_cofactor, negative_cofactor = self._expand_function_on_variable(func, expand_var_index)
+            # Depth fixes the remaining variables, since expansion is always
+            # on the first one
+            key = (func.tt_mask, func.care_mask, depth)
+            node = self.decomposition_cache.get(key)
+            if node is not None:
+                parent_children[label] = node
+                continue
             
-            # Recursively expand cofactors
-            pos_path = expansion_path + [(expand_var_name, 1)]
-            neg_path = expansion_path + [(expand_var_name, 0)]
+            node = _ExpansionNode(func, depth)
+            self.decomposition_cache[key] = node
+            parent_children[label] = node
             
-            node['expansion_variable'] = expand_var_name
-            node['children']['1'] = self._recursive_expand(positive_cofactor, depth + 1, max_depth, pos_path)
-            node['children']['0'] = self._recursive_expand(negative_cofactor, depth + 1, max_depth, neg_path)
-        
-        return node
-    
-    def _expand_function_on_variable(self, func: BooleanFunction, var_index: int) -> Tuple[BooleanFunction, BooleanFunction]:
-        """
-        Expand function on specific variable (helper for recursive expansion)
-        
-        Args:
-            func: Function to expand
-            var_index: Variable index to expand on
+            # Check termination conditions; the constant test and its value
+            # come from the same mask comparison
+            constant_value = self._get_constant_value(func)
+            if (depth >= max_depth or 
+                func.num_variables == 0 or 
+                constant_value is not None):
+                node.is_leaf = True
+                node.constant_value = constant_value
+                continue
             
-        Returns:
-            Tuple of (positive cofactor, negative cofactor)
-        """
-        return self.expand_on_variable(var_index) if func == self.function else self._create_cofactor_pair(func, var_index)
-    
-    def _create_cofactor_pair(self, func: BooleanFunction, var_index: int) -> Tuple[BooleanFunction, BooleanFunction]:
-        """Create cofactor pair for a given function and variable"""
-        # Create temporary Shannon expander for this function
-        temp_expander = ShannonExpansion(func)
-        return temp_expander.expand_on_variable(var_index)
-    
-    def _is_constant_function(self, func: BooleanFunction) -> bool:
-        """Check if function is constant (all 0s or all 1s)"""
-        if not func.truth_table:
-            return True
+            # Choose variable to expand on (use first variable for simplicity)
+            expand_var_index = 0
+            node.expansion_variable = func.variables[expand_var_index]
+            
+            # Perform Shannon expansion
+            positive_cofactor, negative_cofactor = _cofactors(func, expand_var_index)
+            
+            # Push the 0-cofactor first so the 1-cofactor is expanded first
+            stack.append((negative_cofactor, depth + 1, node.children, '0'))
+            stack.append((positive_cofactor, depth + 1, node.children, '1'))
         
-        values = set(func.truth_table.values())
-        return len(values) <= 1
+        return root['root']
     
     def _get_constant_value(self, func: BooleanFunction) -> Optional[int]:
         """Get constant value if function is constant"""
-        if not func.truth_table:
+        if func.tt_mask == 0:
             return 0
-        
-        values = set(func.truth_table.values())
-        return list(values)[0] if len(values) == 1 else None
+        return 1 if func.tt_mask == func.care_mask else None
     
     def generate_multiplexer_implementation(self) -> Dict:
         """
@@ -288,30 +464,32 @@ class ShannonExpansion:
         if not self.expansion_tree:
             self.recursive_expansion()
         
-        return self._create_mux_tree(self.expansion_tree)
+        return self._create_mux_tree(self.expansion_tree, [])
     
-    def _create_mux_tree(self, node: Dict) -> Dict:
+    def _create_mux_tree(self, node: _ExpansionNode, path: List[Tuple[str, int]]) -> Dict:
         """
         Create multiplexer tree from expansion tree
         
         Args:
             node: Expansion tree node
+            path: Path of variable assignments leading to this node
             
         Returns:
             Multiplexer tree node
         """
         mux_node = {
-            'type': 'mux' if not node['is_leaf'] else 'constant',
-            'depth': node['depth'],
-            'path': node['path']
+            'type': 'mux' if not node.is_leaf else 'constant',
+            'depth': node.depth,
+            'path': path
         }
         
-        if node['is_leaf']:
-            mux_node['value'] = node.get('constant_value', 0)
+        if node.is_leaf:
+            mux_node['value'] = node.constant_value
         else:
-            mux_node['select_variable'] = node['expansion_variable']
-            mux_node['input_0'] = self._create_mux_tree(node['children']['0'])
-            mux_node['input_1'] = self._create_mux_tree(node['children']['1'])
+            var = node.expansion_variable
+            mux_node['select_variable'] = var
+            mux_node['input_0'] = self._create_mux_tree(node.children['0'], path + [(var, 0)])
+            mux_node['input_1'] = self._create_mux_tree(node.children['1'], path + [(var, 1)])
         
         return mux_node
     
@@ -336,7 +514,7 @@ class ShannonExpansion:
         
         return expression
     
-    def _node_to_expression(self, node: Dict) -> str:
+    def _node_to_expression(self, node: _ExpansionNode) -> str:
         """
         Convert expansion tree node to Boolean expression
         
@@ -346,34 +524,86 @@ class ShannonExpansion:
         Returns:
             Boolean expression for this node
         """
-        if node['is_leaf']:
-            constant = node.get('constant_value', 0)
-            return '1' if constant == 1 else '0'
+        fragments = []
+        self._emit_expression(node, fragments, {}, {})
+        return ''.join(fragments)
+    
+    def _emit_expression(self, node: _ExpansionNode, fragments: List[str],
+                         zero_memo: Dict[int, bool], spans: Dict[int, Tuple[int, int]]) -> None:
+        """
+        Append the expression fragments of a node to a shared list
         
-        var = node['expansion_variable']
-        expr_1 = self._node_to_expression(node['children']['1'])
-        expr_0 = self._node_to_expression(node['children']['0'])
+        Children are written straight into the list instead of being built
+        as strings and copied into every ancestor. A shared node reuses the
+        fragment span it wrote the first time.
         
-        # Shannon expansion: f = var·f1 + var'·f0
-        terms = []
-        if expr_1 != '0':
-            if expr_1 == '1':
-                terms.append(var)
-            else:
-                terms.append(f"{var}·({expr_1})")
+        Args:
+            node: Expansion tree node
+            fragments: Output list of string fragments
+            zero_memo: Cache of whether a node's expression is '0', by node id
+            spans: (start, end) of each node's fragments already written, by node id
+        """
+        span = spans.get(id(node))
+        if span is not None:
+            fragments.extend(fragments[span[0]:span[1]])
+            return
+        start = len(fragments)
+        
+        if self._expression_is_zero(node, zero_memo):
+            fragments.append('0')
+        elif node.is_leaf:
+            fragments.append('1')
+        else:
+            # Shannon expansion: f = var·f1 + var'·f0
+            var = node.expansion_variable
+            child_1 = node.children['1']
+            child_0 = node.children['0']
+            has_term = False
+            
+            if not self._expression_is_zero(child_1, zero_memo):
+                if child_1.is_leaf:
+                    fragments.append(var)
+                else:
+                    fragments.append(f"{var}·(")
+                    self._emit_expression(child_1, fragments, zero_memo, spans)
+                    fragments.append(')')
+                has_term = True
+            
+            if not self._expression_is_zero(child_0, zero_memo):
+                if has_term:
+                    fragments.append(' + ')
+                if child_0.is_leaf:
+                    fragments.append(f"{var}'")
+                else:
+                    fragments.append(f"{var}'·(")
+                    self._emit_expression(child_0, fragments, zero_memo, spans)
+                    fragments.append(')')
         
-        if expr_0 != '0':
-            if expr_0 == '1':
-                terms.append(f"{var}'")
-            else:
-                terms.append(f"{var}'·({expr_0})")
+        spans[id(node)] = (start, len(fragments))
+    
+    def _expression_is_zero(self, node: _ExpansionNode, zero_memo: Dict[int, bool]) -> bool:
+        """
+        Check whether a node's expression comes out as '0'
         
-        if not terms:
-            return '0'
-        elif len(terms) == 1:
-            return terms[0]
-        else:
-            return ' + '.join(terms)
+        Leaves are '0' unless their constant is 1. An internal node is '0'
+        only when both children are, and is never '1'.
+        
+        Args:
+            node: Expansion tree node
+            zero_memo: Cache of results by node id
+            
+        Returns:
+            True if the node's expression is '0'
+        """
+        result = zero_memo.get(id(node))
+        if result is None:
+            if node.is_leaf:
+                result = node.constant_value != 1
+            else:
+                result = (self._expression_is_zero(node.children['1'], zero_memo)
+                          and self._expression_is_zero(node.children['0'], zero_memo))
+            zero_memo[id(node)] = result
+        return result
     
     def _simplify_expression(self, expression: str) -> str:
         """
@@ -385,22 +615,11 @@ class ShannonExpansion:
         Returns:
             Simplified expression
         """
-        # Basic simplification rules
-        simplified = expression
-        
-        # Remove redundant parentheses and clean up
-        simplified = simplified.replace('·(1)', '')
-        simplified = simplified.replace('(1)·', '')
-        simplified = simplified.replace(' + 0', '')
-        simplified = simplified.replace('0 + ', '')
-        simplified = simplified.replace('·0', '0')
-        simplified = simplified.replace('0·', '0')
+        # Remove redundant constants and collapse runs of spaces in one scan
+        simplified = _SIMPLIFY_RE.sub(
+            lambda match: _SIMPLIFY_REPLACEMENTS.get(match.group(), ' '), expression).strip()
         
-        # Clean up multiple spaces and operators
-        while '  ' in simplified:
-            simplified = simplified.replace('  ', ' ')
-        
-        return simplified.strip() if simplified.strip() else '0'
+        return simplified if simplified else '0'
     
     def display_expansion_tree(self) -> str:
         """
@@ -412,15 +631,16 @@ class ShannonExpansion:
         if not self.expansion_tree:
             self.recursive_expansion()
         
-        return self._format_tree_node(self.expansion_tree, 0)
+        return self._format_tree_node(self.expansion_tree, 0, ())
     
-    def _format_tree_node(self, node: Dict, indent_level: int) -> str:
+    def _format_tree_node(self, node: _ExpansionNode, indent_level: int, path: Tuple[Tuple[str, int], ...]) -> str:
         """
         Format a single node of the expansion tree
         
         Args:
             node: Tree node to format
             indent_level: Current indentation level
+            path: Path of variable assignments leading to this node
             
         Returns:
             Formatted string for this node and its children
@@ -428,20 +648,20 @@ class ShannonExpansion:
         indent = "  " * indent_level
         result = ""
         
-        if node['is_leaf']:
-            path_str = " → ".join([f"{var}={val}" for var, val in node['path']])
-            constant = node.get('constant_value', 0)
+        if node.is_leaf:
+            path_str = " → ".join([f"{var}={val}" for var, val in path])
+            constant = node.constant_value
             result += f"{indent}Leaf: {path_str} → {constant}\n"
         else:
-            var = node['expansion_variable']
-            path_str = " → ".join([f"{var}={val}" for var, val in node['path']])
+            var = node.expansion_variable
+            path_str = " → ".join([f"{var}={val}" for var, val in path])
             result += f"{indent}Node: {path_str} | Expand on {var}\n"
             
             result += f"{indent}├─ {var}=1:\n"
-            result += self._format_tree_node(node['children']['1'], indent_level + 1)
+            result += self._format_tree_node(node.children['1'], indent_level + 1, path + ((var, 1),))
             
             result += f"{indent}└─ {var}=0:\n"
-            result += self._format_tree_node(node['children']['0'], indent_level + 1)
+            result += self._format_tree_node(node.children['0'], indent_level + 1, path + ((var, 0),))
         
         return result
     
@@ -457,6 +677,15 @@ class ShannonExpansion:
         
         metrics = self._calculate_tree_metrics(self.expansion_tree)
         
+        # Distinct nodes once identical subtrees are shared
+        unique_nodes = {}
+        stack = [self.expansion_tree]
+        while stack:
+            node = stack.pop()
+            if id(node) not in unique_nodes:
+                unique_nodes[id(node)] = node
+                stack.extend(node.children.values())
+        
         return {
             'total_nodes': metrics['node_count'],
             'leaf_nodes': metrics['leaf_count'],
@@ -464,44 +693,56 @@ class ShannonExpansion:
             'tree_depth': metrics['max_depth'],
             'avg_path_length': metrics['avg_path_length'],
             'multiplexer_count': metrics['internal_count'],
-            'constant_inputs': metrics['leaf_count']
+            'constant_inputs': metrics['leaf_count'],
+            'unique_nodes': len(unique_nodes),
+            'shared_multiplexer_count': sum(1 for node in unique_nodes.values() if not node.is_leaf)
         }
     
-    def _calculate_tree_metrics(self, node: Dict) -> Dict:
-        """Calculate metrics for expansion tree"""
-        if node['is_leaf']:
-            return {
-                'node_count': 1,
-                'leaf_count': 1,
-                'internal_count': 0,
-                'max_depth': node['depth'],
-                'path_lengths': [node['depth']],
-                'avg_path_length': node['depth']
-            }
-        
-        # Recursively calculate for children
-        child_0_metrics = self._calculate_tree_metrics(node['children']['0'])
-        child_1_metrics = self._calculate_tree_metrics(node['children']['1'])
-        
-        # Combine metrics
-        total_nodes = 1 + child_0_metrics['node_count'] + child_1_metrics['node_count']
-        total_leaves = child_0_metrics['leaf_count'] + child_1_metrics['leaf_count']
-        total_internal = 1 + child_0_metrics['internal_count'] + child_1_metrics['internal_count']
-        max_depth = max(child_0_metrics['max_depth'], child_1_metrics['max_depth'])
-        
-        path_lengths = child_0_metrics['path_lengths'] + child_1_metrics['path_lengths']
-        avg_path_length = sum(path_lengths) / len(path_lengths) if path_lengths else 0
+    def _calculate_tree_metrics(self, node: _ExpansionNode) -> Dict:
+        """
+        Calculate metrics for expansion tree
+        
+        Counts are taken over the tree as displayed, so a shared subtree
+        contributes once per path that reaches it. Each distinct node is
+        summarised once, bottom-up, as (node_count, leaf_count,
+        internal_count, max_depth, path_sum, path_count).
+        """
+        summaries = {}
+        stack = [(node, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if id(current) in summaries:
+                continue
+            if current.is_leaf:
+                summaries[id(current)] = (1, 1, 0, current.depth, current.depth, 1)
+            elif children_done:
+                zero = summaries[id(current.children['0'])]
+                one = summaries[id(current.children['1'])]
+                summaries[id(current)] = (1 + zero[0] + one[0],
+                                          zero[1] + one[1],
+                                          1 + zero[2] + one[2],
+                                          max(zero[3], one[3]),
+                                          zero[4] + one[4],
+                                          zero[5] + one[5])
+            else:
+                stack.append((current, True))
+                stack.append((current.children['1'], False))
+                stack.append((current.children['0'], False))
+        
+        node_count, leaf_count, internal_count, max_depth, path_sum, path_count = summaries[id(node)]
+        if node.is_leaf:
+            avg_path_length = node.depth
+        else:
+            avg_path_length = path_sum / path_count if path_count else 0
         
         return {
-            'node_count': total_nodes,
-            'leaf_count': total_leaves,
-            'internal_count': total_internal,
+            'node_count': node_count,
+            'leaf_count': leaf_count,
+            'internal_count': internal_count,
             'max_depth': max_depth,
-            'path_lengths': path_lengths,
             'avg_path_length': avg_path_length
         }
 
-
 def test_shannon_expansion():
     """Test Shannon expansion functionality"""
     print("Testing Shannon Expansion Algorithm")
@@ -541,6 +782,16 @@ def test_shannon_expansion():
     print(f"\nComplexity Analysis:")
     for metric, value in complexity.items():
         print(f"  {metric}: {value}")
+    
+    # Batch evaluation matches per-input evaluate over the whole input space
+    all_inputs = [list(bits) for bits in itertools.product([0, 1], repeat=3)]
+    assert func.evaluate_batch(all_inputs) == [func.evaluate(bits) for bits in all_inputs]
+    
+    # Including a partial truth table whose don't-care inputs (2 and 5) are left out
+    partial = BooleanFunction({0: 1, 1: 0, 3: 1, 4: 1, 6: 0, 7: 1}, num_variables=3)
+    batch = partial.evaluate_batch(all_inputs)
+    assert batch == [partial.evaluate(bits) for bits in all_inputs]
+    print(f"\nBatch evaluation (don't cares at 2, 5): {batch}")
 
 
 if __name__ == "__main__":
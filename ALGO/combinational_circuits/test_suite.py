@@ -64,12 +64,8 @@ def comprehensive_comparison_test():
     print("\n3. SHANNON EXPANSION ANALYSIS")
     print("-" * 40)
     try:
-        # Create truth table
-        truth_table = [0] * (2**num_vars)
-        for m in test_minterms:
-            truth_table[m] = 1
-        
-        func = BooleanFunction(truth_table, num_variables=num_vars)
+        # Build the function straight from the minterms
+        func = BooleanFunction.from_minterms(test_minterms, num_variables=num_vars)
         func.variables = ['A', 'B', 'C', 'D']
         
         shannon = ShannonExpansion(func)
@@ -210,6 +206,30 @@ def algorithm_performance_test():
         print(f"Algorithms tested: {algorithms_tested}")
 
 
+def test_boolean_function_from_minterms():
+    """
+    Check that BooleanFunction.from_minterms builds the same masks as the
+    truth-table constructor
+    """
+    minterms = [0, 1, 4, 5, 6, 7, 8, 9, 10, 14, 15]
+    dont_cares = [2, 11]
+    num_vars = 4
+    
+    # Fully specified: same as a 0/1 truth table list
+    truth_table = [1 if m in minterms else 0 for m in range(2**num_vars)]
+    expected = BooleanFunction(truth_table, num_variables=num_vars)
+    func = BooleanFunction.from_minterms(minterms, num_variables=num_vars)
+    assert (func.tt_mask, func.care_mask) == (expected.tt_mask, expected.care_mask)
+    assert func.num_variables == expected.num_variables
+    assert func.variables == expected.variables
+    
+    # Don't cares: same as a dict truth table that leaves them out
+    partial = {m: truth_table[m] for m in range(2**num_vars) if m not in dont_cares}
+    expected = BooleanFunction(partial, num_variables=num_vars)
+    func = BooleanFunction.from_minterms(minterms, num_variables=num_vars, dont_cares=dont_cares)
+    assert (func.tt_mask, func.care_mask) == (expected.tt_mask, expected.care_mask)
+
+
 def run_all_tests():
     """Run all individual algorithm tests"""
     print("RUNNING ALL ALGORITHM TESTS")
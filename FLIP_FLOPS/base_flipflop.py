@@ -100,6 +100,42 @@ class BaseFlipFlop:
         
         return effective_set, effective_reset
     
+    def run_waveform(self, clock_wave, *data_waves, set_wave=None, reset_wave=None):
+        """
+        Drive the flip-flop through a whole waveform in one call
+        
+        Each tick calls update() with that tick's data inputs, clock, set and
+        reset, so every subclass keeps its own next-state behaviour.
+        
+        Args:
+            clock_wave (list): Clock signal per tick (0 or 1)
+            *data_waves (list): One list per data input, in update() order
+            set_wave (list): Set signal per tick (default: inactive level)
+            reset_wave (list): Reset signal per tick (default: inactive level)
+            
+        Returns:
+            list: Q output after each tick
+            
+        Raises:
+            ValueError: If any wave is not as long as clock_wave
+        """
+        ticks = len(clock_wave)
+        if set_wave is None:
+            set_wave = [0 if self.active_high_set else 1] * ticks
+        if reset_wave is None:
+            reset_wave = [0 if self.active_high_reset else 1] * ticks
+        
+        for wave in (*data_waves, set_wave, reset_wave):
+            if len(wave) != ticks:
+                raise ValueError(f"All waves must have {ticks} ticks to match clock_wave, got {len(wave)}")
+        
+        update = self.update
+        q_wave = []
+        append = q_wave.append
+        for inputs in zip(*data_waves, clock_wave, set_wave, reset_wave):
+            append(update(*inputs)[0])
+        return q_wave
+    
     def get_outputs(self):
         """
         Get current outputs
@@ -223,7 +223,51 @@ def test_d_latch():
         q, q_bar = d_latch.update(d, enable)
         print(f"{desc}: D={d}, EN={enable} -> Q={q}, Q̄={q_bar}")
 
+def test_run_waveform():
+    """Test driving a D Flip-Flop with whole waveforms"""
+    print("\n=== D Flip-Flop Waveform Test ===")
+    
+    clock = [0, 1, 0, 1, 0, 1]
+    data = [1, 1, 0, 0, 1, 0]
+    
+    # Plain D flip-flop: Q follows D on each rising edge
+    d_ff = DFlipFlop()
+    q_wave = d_ff.run_waveform(clock, data)
+    print(f"CLK={clock}, D={data} -> Q={q_wave}")
+    assert q_wave == [0, 1, 1, 0, 0, 0]
+    
+    # Same result tick by tick through update()
+    d_ff_ticks = DFlipFlop()
+    assert q_wave == [d_ff_ticks.update(d, clk)[0] for d, clk in zip(data, clock)]
+    
+    # Active-low set/reset default to their inactive level (1)
+    d_ff_low = DFlipFlop(active_high_set=False, active_high_reset=False)
+    q_wave_low = d_ff_low.run_waveform(clock, data)
+    print(f"Active-low set/reset defaults -> Q={q_wave_low}")
+    assert q_wave_low == q_wave
+    
+    # Explicit active-low reset pulse clears Q
+    d_ff_low = DFlipFlop(active_high_set=False, active_high_reset=False)
+    q_wave_reset = d_ff_low.run_waveform(clock, data, reset_wave=[1, 1, 0, 1, 1, 1])
+    print(f"Active-low reset pulse at tick 2 -> Q={q_wave_reset}")
+    assert q_wave_reset == [0, 1, 0, 0, 0, 0]
+    
+    # Waves that do not match the clock length are rejected
+    mismatched_cases = [
+        ((data[:1],), {}),
+        ((data,), {'set_wave': [0] * 5}),
+        ((data,), {'reset_wave': [0] * 7}),
+    ]
+    for waves, kwargs in mismatched_cases:
+        try:
+            DFlipFlop().run_waveform(clock, *waves, **kwargs)
+        except ValueError as e:
+            print(f"Mismatched waves rejected: {e}")
+        else:
+            raise AssertionError("run_waveform accepted mismatched wave lengths")
+
 if __name__ == "__main__":
     test_d_flipflop()
     test_d_flipflop_from_sr()
     test_d_latch()
+    test_run_waveform()